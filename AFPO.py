@@ -1,8 +1,13 @@
-import copy
-from solution import Solution
+import logging
+import numpy
+from population import Population
+from evaluator import Evaluator
+from fitnesscache import FitnessCache
+from checkpoint import save_checkpoint, load_checkpoint
+from selection import select_survivors
 import constants as c
-import os
-import random
+
+logger = logging.getLogger(__name__)
 
 class AFPO:
     """
@@ -15,8 +20,22 @@ class AFPO:
     NextAvailableID : int
         Assigns an ID to each Solution generated
 
-    Population : Solution array
-        Holds all of the Solutions created or maintained in each generation
+    Generation : int
+        Number of generations evolved so far, including those restored from a checkpoint
+
+    Population : Population
+        Holds the genomes, IDs, ages and fitness values of all individuals created or maintained in each generation
+
+    Evaluator : Evaluator
+        Pool of persistent worker processes used to simulate the population, or a Coordinator of remote workers
+        when c.EVALUATION_BACKEND is "distributed"
+
+    FitnessCache : FitnessCache
+        Fitness of every genome simulated so far, so surviving parents and identical genomes are not simulated again
+
+    Profiles : dict array
+        Profiler totals of the simulations of every generation, with the generation number under "Generation".
+        Only filled when c.PROFILE is set
 
     Methods
     ________
@@ -24,66 +43,95 @@ class AFPO:
         Increase population by adding random individuals to the population
 
     contract_population_for_one_generation()
-        Decreases population size by comparing the fitness and age of two random individuals in a population
-        and deleting the older, less fit indiviuals until the original population size is acquired
+        Decreases population size back to the original population size in one pass by keeping the individuals on
+        the best age-fitness Pareto fronts
 
     evolve()
         Expands the population, then determines fitness values for each individual, followed by a contraction of
-        population and subsequent incrementing of each individual's age
+        population and subsequent incrementing of each individual's age. Every c.CHECKPOINT_INTERVAL generations
+        the run is saved to c.CHECKPOINT_FILE
+
+    evolve_asynchronously(InFlight)
+        Steady-state alternative to evolve() without a barrier between generations. Up to InFlight new individuals
+        are bred from the current population and kept in simulation at once, by default two batches for every task
+        the Evaluator can simulate at once, see Evaluator.capacity(). As soon as any fitness value arrives the
+        individual joins the population, which is contracted right away, and a replacement is sent to the workers.
+        Every c.POPULATION_SIZE + c.NUM_INDIVIDUALS_ADDED_PER_GENERATION evaluations count as one generation for ageing,
+        the c.NUM_GENERATIONS budget and checkpoints. Individuals keep ageing while in simulation, so each joins with
+        its age at breeding plus the generations that passed meanwhile, as its parent would have aged. Individuals
+        still in simulation are not saved in checkpoints
+
+    record_profile()
+        Appends the Profiler totals the Evaluator collected since the previous generation to Profiles and logs them at
+        INFO level
+
+    save(FileName)
+        Saves the population, ID counter, generation counter and random number generator state to FileName
+
+    resume(FileName)
+        Restores a run saved by save() so evolve() continues where it stopped
 
     spawn()
-        Creates the initial set of individuals in the population and assigns each an ID
+        Clones every parent in the population and assigns each clone a new ID
 
     mutate()
-        Calls the mutate method from Solution for each individual in the population
+        Mutates every clone created by spawn() in one array operation
 
     show_best()
         Selects the fittest individual and displays the robot in motion in the PyBullet GUI
 
-    evaluate(Solutions)
-        Determines the fitness value for each individual by simulating their behavior in PyBullet
+    evaluate(population)
+        Determines the fitness value for each individual by simulating their behavior in PyBullet using the
+        Evaluator's worker pool, unless the FitnessCache already holds it. The best fitness found so far is passed
+        along so hopeless simulations can be stopped early. Truncated fitness values are never cached
 
     is_younger(Solution1, Solution2)
-        Compares the MyAge value for Solution1 and Solution2, returns True if Solution1.MyAge is less, False otherwise
+        Compares the ages of the individuals at Solution1 and Solution2, returns True if Solution1 is not older,
+        False otherwise
 
     is_fitter(Solution1, Solution2)
-        Compares the Fitness value for Solution1 and Solution2, returns True if Solution1.Fitness is less than or equal
-        to Solution2.Fitness, False otherwise.
+        Compares the fitness values of the individuals at Solution1 and Solution2, returns True if Solution1 has the
+        lower Fitness, False otherwise.
 
     increment_age_of_population()
-        All individuals in population have MyAge value increased by 1
+        All individuals in population have their age increased by 1
 
-    add_random_individuals_to_population()
-        Doubles the size of the population by adding more random individuals
+    add_random_individuals_to_population(Count)
+        Adds Count random individuals to the population
 
-    population_reorder(randNum)
-        Assigns new position for an individual after the population size has decreased
+    take_ids(Count)
+        Returns the next Count available IDs
 
     show_population()
         Prints all members of the population and their associated fitness value to terminal
+
+    close()
+        Stops the Evaluator's worker processes and saves the FitnessCache
     """
-    def __init__(self):
+    def __init__(self, NumWorkers=None):
         self.NextAvailableID = 0
-        self.Population = {}
-        for x in range(c.POPULATION_SIZE):
-            self.Population[x] = Solution(self.NextAvailableID)
-            self.NextAvailableID += 1
-
-        #These commands clear any files that were not properly deleted in the last run
-        os.system("rm brain*.nndf")
-        os.system("rm fitness*.txt")
-        os.system("rm tmp*.txt")
+        self.Generation = 0
+        self.Population = Population()
+        self.add_random_individuals_to_population(c.POPULATION_SIZE)
+        if c.EVALUATION_BACKEND == "distributed":
+            from distributed import Coordinator
+            self.Evaluator = Coordinator()
+        else:
+            self.Evaluator = Evaluator(NumWorkers)
+        self.FitnessCache = FitnessCache()
+        self.Profiles = []
 
     def expand_population_for_one_generation(self):
         self.spawn()
         self.mutate()
-        self.add_random_individuals_to_population()
+        self.add_random_individuals_to_population(c.NUM_INDIVIDUALS_ADDED_PER_GENERATION)
 
     def contract_population_for_one_generation(self):
         """
-        This method compares two individuals at random in the population.
-        If one individual is both younger and fitter than the other, then the second older and less fit
-        individual is removed from the population.
+        This method sorts the population into non-dominated age-fitness fronts in O(n log n) time.
+        Whole fronts are kept, starting with the Pareto front of individuals that no other individual is both
+        younger and fitter than, until the original population size is reached. The last front that only partly
+        fits is cut by fitness. The surviving individuals keep their relative order.
 
         Parameters:
         none
@@ -92,82 +140,135 @@ class AFPO:
         none
 
        """
-        while len(self.Population) != c.POPULATION_SIZE:
-            RandNum1 = random.randint(0, (len(self.Population) - 3))
-            RandNum2 = random.randint(0, (len(self.Population) - 3))
-
-            if (self.is_younger(RandNum1, RandNum2) and self.is_fitter(RandNum1, RandNum2)):
-                del self.Population[RandNum2]
-                self.population_reorder(RandNum2)
-
-            if (self.is_younger(RandNum2, RandNum1) and self.is_fitter(RandNum2, RandNum1)):
-                del self.Population[RandNum1]
-                self.population_reorder(RandNum1)
+        Survivors = select_survivors(self.Population.Ages, self.Population.Fitnesses, c.POPULATION_SIZE)
+        self.Population.select(Survivors)
 
     def evolve(self):
-        for currentGeneration in range(c.NUM_GENERATIONS):
+        while self.Generation < c.NUM_GENERATIONS:
             self.expand_population_for_one_generation()
             self.evaluate(self.Population)
             self.contract_population_for_one_generation()
             self.increment_age_of_population()
+            self.Generation += 1
+            if c.PROFILE:
+                self.record_profile()
+            if c.CHECKPOINT_FILE is not None and self.Generation % c.CHECKPOINT_INTERVAL == 0:
+                self.save(c.CHECKPOINT_FILE)
+
+    def evolve_asynchronously(self, InFlight=None):
+        if numpy.isnan(self.Population.Fitnesses).any():
+            self.evaluate(self.Population)
 
+        EvaluationsPerGeneration = c.POPULATION_SIZE + c.NUM_INDIVIDUALS_ADDED_PER_GENERATION
+        RandomFraction = c.NUM_INDIVIDUALS_ADDED_PER_GENERATION / EvaluationsPerGeneration
+        Remaining = max(0, c.NUM_GENERATIONS - self.Generation) * EvaluationsPerGeneration
+        Pending = {}
+        Arrived = []
+        Evaluations = 0
+        while Remaining or Pending:
+            Limit = InFlight
+            if Limit is None:
+                Limit = 2 * self.Evaluator.capacity() * self.Evaluator.BatchSize
+            while Remaining and len(Pending) < Limit:
+                Count = min(self.Evaluator.BatchSize, Remaining)
+                Remaining -= Count
+                IDs = self.take_ids(Count)
+                Genomes, Ages = self.Population.breed(Count, RandomFraction)
+                Missing = []
+                for x in range(Count):
+                    Pending[int(IDs[x])] = (Genomes[x], Ages[x], self.Generation)
+                    CachedFitness = self.FitnessCache.get(Genomes[x])
+                    if CachedFitness is None:
+                        Missing.append(x)
+                    else:
+                        Arrived.append((int(IDs[x]), CachedFitness, False))
+                self.Evaluator.submit(IDs[Missing], Genomes[Missing], float(self.Population.Fitnesses.min()))
+
+            if not Arrived:
+                Arrived.append(self.Evaluator.collect())
+            SolutionID, Fitness, WasStopped = Arrived.pop()
+            Genome, Age, Generation = Pending.pop(SolutionID)
+            Age += self.Generation - Generation
+            if not WasStopped:
+                self.FitnessCache.put(Genome, Fitness)
+            self.Population.append(Genome[numpy.newaxis], [SolutionID], [Age], [Fitness], [WasStopped])
+            self.contract_population_for_one_generation()
 
-    def spawn(self):
-        for x in range(c.POPULATION_SIZE):
-            self.Population[c.POPULATION_SIZE + x] = copy.deepcopy(self.Population[x])
-            self.Population[c.POPULATION_SIZE + x].MyID = self.NextAvailableID
-            self.NextAvailableID += 1
+            Evaluations += 1
+            if Evaluations % EvaluationsPerGeneration == 0:
+                self.increment_age_of_population()
+                self.Generation += 1
+                if c.PROFILE:
+                    self.record_profile()
+                if c.CHECKPOINT_FILE is not None and self.Generation % c.CHECKPOINT_INTERVAL == 0:
+                    self.save(c.CHECKPOINT_FILE)
 
-    def mutate(self):
-        for x in range(c.POPULATION_SIZE):
-            self.Population[c.POPULATION_SIZE + x].mutate()
+    def record_profile(self):
+        Profile = self.Evaluator.take_profile()
+        Profile["Generation"] = self.Generation
+        self.Profiles.append(Profile)
+        logger.info("Generation %d profile: %s", self.Generation, Profile)
 
-    def show_best(self):
-        best = 0
-        for x in range(c.POPULATION_SIZE):
-            if self.Population[best].Fitness > self.Population[x].Fitness:
-                best = x
+    def save(self, FileName):
+        save_checkpoint(FileName, self)
 
-        self.Population[best].start_simulation("GUI")
+    def resume(self, FileName):
+        load_checkpoint(FileName, self)
 
-    def evaluate(self, Solutions):
-        for x in range(len(self.Population)):
-            Solutions[x].start_simulation("DIRECT")
 
-        for x in range(len(self.Population)):
-            Solutions[x].wait_for_simulation_to_end()
+    def spawn(self):
+        self.Population.clone(numpy.arange(c.POPULATION_SIZE), self.take_ids(c.POPULATION_SIZE))
+
+    def mutate(self):
+        self.Population.mutate(numpy.arange(c.POPULATION_SIZE, 2 * c.POPULATION_SIZE))
+
+    def show_best(self):
+        best = int(numpy.argmin(self.Population.Fitnesses[:c.POPULATION_SIZE]))
+        self.Population.get_solution(best).start_simulation("GUI")
+
+    def evaluate(self, population):
+        Evaluated = population.Fitnesses[~numpy.isnan(population.Fitnesses)]
+        Target = float(Evaluated.min()) if len(Evaluated) else None
+        Fitnesses = numpy.full(len(population), numpy.nan)
+        Stopped = numpy.zeros(len(population), dtype=bool)
+        for x in range(len(population)):
+            CachedFitness = self.FitnessCache.get(population.Genomes[x])
+            if CachedFitness is not None:
+                Fitnesses[x] = CachedFitness
+
+        Missing = numpy.flatnonzero(numpy.isnan(Fitnesses))
+        if len(Missing):
+            Fitnesses[Missing], Stopped[Missing] = self.Evaluator.evaluate_genomes(population.IDs[Missing],
+                                                                                   population.Genomes[Missing], Target)
+            for x in Missing:
+                if not Stopped[x]:
+                    self.FitnessCache.put(population.Genomes[x], Fitnesses[x])
+
+        population.Fitnesses = Fitnesses
+        population.Stopped = Stopped
 
     def is_younger(self, Solution1, Solution2):
-        if self.Population[Solution1].MyAge > self.Population[Solution2].MyAge:
-            return False
-        if self.Population[Solution1].MyAge <= self.Population[Solution2].MyAge:
-            return True
+        return self.Population.Ages[Solution1] <= self.Population.Ages[Solution2]
 
     def is_fitter(self, Solution1, Solution2):
-        if self.Population[Solution1].Fitness >= self.Population[Solution2].Fitness:
-            return False
-        if self.Population[Solution1].Fitness < self.Population[Solution2].Fitness:
-            return True
+        return self.Population.Fitnesses[Solution1] < self.Population.Fitnesses[Solution2]
 
     def increment_age_of_population(self):
-        for x in range(len(self.Population)):
-            self.Population[x].MyAge += 1
+        self.Population.increment_ages()
 
-    def add_random_individuals_to_population(self):
-        for x in range(c.NUM_INDIVIDUALS_ADDED_PER_GENERATION):
-            self.Population[(2 * c.POPULATION_SIZE) + x] = Solution(self.NextAvailableID)
-            self.NextAvailableID += 1
+    def add_random_individuals_to_population(self, Count):
+        self.Population.add_random(self.take_ids(Count))
 
-    def population_reorder(self, randNum):
-        if randNum == len(self.Population):
-            randNum = randNum
-        else:
-            while randNum < len(self.Population) - 1:
-                self.Population[randNum] = self.Population[randNum + 1]
-                randNum += 1
-            del self.Population[randNum]
+    def take_ids(self, Count):
+        IDs = numpy.arange(self.NextAvailableID, self.NextAvailableID + Count)
+        self.NextAvailableID += Count
+        return IDs
 
     def show_population(self):
         for x in range(len(self.Population)):
             print("The fitness of the element at " + str(x) + " is " + str(
-                self.Population[x].Fitness) + ". There are " + str(len(self.Population)) + "remaining.")
+                self.Population.Fitnesses[x]) + ". There are " + str(len(self.Population)) + "remaining.")
+
+    def close(self):
+        self.Evaluator.close()
+        self.FitnessCache.save()
@@ -0,0 +1,109 @@
+import hashlib
+import os
+import threading
+import constants as c
+from pyrosim.morphology import MORPHOLOGY
+
+WORLD_SPEC = (
+    ("Cube", {"name": "Box", "pos": [-2, 2, 0.5], "size": [1.0, 1.0, 1.0]}),
+)
+
+BODY_SPEC = (
+    ("Cube", {"name": "Torso", "pos": [0, 0, 1], "size": [1, 1, 1]}),
+    ("Joint", {"name": "Torso_BackLeg", "parent": "Torso", "child": "BackLeg", "type": "revolute", "position": "0 -0.5 1.0", "jointAxis": "1 0 0"}),
+    ("Cube", {"name": "BackLeg", "pos": [0, -0.5, 0], "size": [.2, 1, .2]}),
+    ("Joint", {"name": "BackLeg_BackLowerLeg", "parent": "BackLeg", "child": "BackLowerLeg", "type": "revolute", "position": "0 -1 0", "jointAxis": "1 0 0"}),
+    ("Cube", {"name": "BackLowerLeg", "pos": [0, 0, -0.5], "size": [.2, .2, 1]}),
+    ("Joint", {"name": "Torso_FrontLeg", "parent": "Torso", "child": "FrontLeg", "type": "revolute", "position": "0 0.5 1.0", "jointAxis": "1 0 0"}),
+    ("Cube", {"name": "FrontLeg", "pos": [0, 0.5, 0], "size": [.2, 1, .2]}),
+    ("Joint", {"name": "FrontLeg_FrontLowerLeg", "parent": "FrontLeg", "child": "FrontLowerLeg", "type": "revolute", "position": "0 1 0", "jointAxis": "1 0 0"}),
+    ("Cube", {"name": "FrontLowerLeg", "pos": [0, 0, -0.5], "size": [.2, .2, 1]}),
+    ("Joint", {"name": "Torso_LeftLeg", "parent": "Torso", "child": "LeftLeg", "type": "revolute", "position": "-0.5 0 1.0", "jointAxis": "0 1 0"}),
+    ("Cube", {"name": "LeftLeg", "pos": [-0.5, 0, 0], "size": [1, .2, .2]}),
+    ("Joint", {"name": "LeftLeg_LeftLowerLeg", "parent": "LeftLeg", "child": "LeftLowerLeg", "type": "revolute", "position": "-1 0 0", "jointAxis": "0 1 0"}),
+    ("Cube", {"name": "LeftLowerLeg", "pos": [0, 0, -0.5], "size": [.2, .2, 1]}),
+    ("Joint", {"name": "Torso_RightLeg", "parent": "Torso", "child": "RightLeg", "type": "revolute", "position": "0.5 0 1.0", "jointAxis": "0 1 0"}),
+    ("Cube", {"name": "RightLeg", "pos": [0.5, 0, 0], "size": [1, .2, .2]}),
+    ("Joint", {"name": "RightLeg_RightLowerLeg", "parent": "RightLeg", "child": "RightLowerLeg", "type": "revolute", "position": "1 0 0", "jointAxis": "0 1 0"}),
+    ("Cube", {"name": "RightLowerLeg", "pos": [0, 0, -0.5], "size": [.2, .2, 1]}),
+)
+
+AssetFiles = {}
+Morphologies = {}
+
+
+def get_world_file():
+    """
+    Returns the path of the cached SDF file for WORLD_SPEC, generating it on first use.
+    """
+    return get_asset_file("world", ".sdf", WORLD_SPEC)
+
+
+def get_body_file():
+    """
+    Returns the path of the cached URDF file for BODY_SPEC, generating it on first use.
+    """
+    return get_asset_file("body", ".urdf", BODY_SPEC)
+
+
+def get_body_morphology():
+    """
+    Returns the link and joint index tables of BODY_SPEC as a pyrosim MORPHOLOGY, built from the Spec once per
+    process so no Robot has to parse the URDF file.
+    """
+    if "body" not in Morphologies:
+        morphology = MORPHOLOGY()
+        for Element, Arguments in BODY_SPEC:
+            if Element == "Cube":
+                morphology.Add_Link(Arguments["name"])
+            else:
+                morphology.Add_Joint(Arguments["name"])
+        Morphologies["body"] = morphology
+    return Morphologies["body"]
+
+
+def get_asset_file(Kind, Extension, Spec):
+    """
+    Returns the path of the asset described by Spec inside c.ASSET_CACHE_DIRECTORY. The file name contains a hash of
+    the Spec, so an asset is generated only once for every distinct morphology or world and is then shared by all
+    processes. A new asset is written to a temporary file first and renamed into place, so a reader never sees a
+    partially written file.
+    """
+    Digest = hashlib.sha1(repr(Spec).encode()).hexdigest()[:16]
+    FileName = os.path.join(c.ASSET_CACHE_DIRECTORY, Kind + "-" + Digest + Extension)
+    if FileName in AssetFiles:
+        return FileName
+
+    if not os.path.exists(FileName):
+        os.makedirs(c.ASSET_CACHE_DIRECTORY, exist_ok=True)
+        TemporaryFileName = FileName + "." + str(os.getpid()) + "." + str(threading.get_ident()) + ".tmp"
+        write_asset(Extension, Spec, TemporaryFileName)
+        os.replace(TemporaryFileName, FileName)
+
+    AssetFiles[FileName] = True
+    return FileName
+
+
+def render_asset(Extension, Spec):
+    """
+    Returns the SDF or URDF document described by Spec as bytes, rendered in memory without touching the filesystem.
+    Every call uses its own pyrosim writer, so assets can be rendered from several threads at once.
+    """
+    from pyrosim.writer import SDF_WRITER, URDF_WRITER
+
+    Writer = SDF_WRITER if Extension == ".sdf" else URDF_WRITER
+    with Writer() as writer:
+        for Element, Arguments in Spec:
+            if Element == "Cube":
+                writer.Send_Cube(**Arguments)
+            else:
+                writer.Send_Joint(**Arguments)
+    return writer.contents
+
+
+def write_asset(Extension, Spec, FileName):
+    """
+    Writes the document rendered by render_asset to FileName with a single write.
+    """
+    with open(FileName, "wb") as f:
+        f.write(render_asset(Extension, Spec))
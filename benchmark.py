@@ -0,0 +1,214 @@
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import numpy
+import pybullet as p
+import constants as c
+from pyrosim.neuralNetwork import NEURAL_NETWORK
+from pyrosim.matrixNeuralNetwork import MATRIX_NEURAL_NETWORK
+from assets import WORLD_SPEC, BODY_SPEC, write_asset
+from brain import build_neural_network
+from profiler import Profiler
+from simulation import Simulation
+from solution import Solution
+
+def time_call(Function, Repeats):
+    """
+    Calls Function Repeats times and returns the mean duration of one call in seconds.
+    """
+    Start = time.perf_counter()
+    for x in range(Repeats):
+        Function()
+    return (time.perf_counter() - Start) / Repeats
+
+
+def summarize(Durations):
+    """
+    Returns the mean and the 50th, 90th and 99th percentile and maximum of Durations, in microseconds.
+    """
+    Durations = numpy.asarray(Durations) * 1e6
+    return {"mean_us": float(Durations.mean()),
+            "p50_us": float(numpy.percentile(Durations, 50)),
+            "p90_us": float(numpy.percentile(Durations, 90)),
+            "p99_us": float(numpy.percentile(Durations, 99)),
+            "max_us": float(Durations.max())}
+
+
+def benchmark_setup(Weights, Repeats):
+    """
+    Times every stage needed before a Simulation can take its first step: generating the world and body files,
+    writing and parsing an NNDF brain, building the brain in memory, compiling it for the matrix engine and loading
+    the World and Robot into a DIRECT physics client. Returns the mean duration of each stage in seconds.
+    """
+    Stages = {}
+    with tempfile.TemporaryDirectory() as Directory:
+        Stages["world_file"] = time_call(lambda: write_asset(".sdf", WORLD_SPEC, os.path.join(Directory, "w.sdf")),
+                                         Repeats)
+        Stages["body_file"] = time_call(lambda: write_asset(".urdf", BODY_SPEC, os.path.join(Directory, "b.urdf")),
+                                        Repeats)
+
+    solution = Solution(0)
+    solution.Weights = Weights
+    Stages["nndf_write"] = time_call(solution.create_brain, Repeats)
+    Stages["nndf_parse"] = time_call(lambda: NEURAL_NETWORK("brain0.nndf"), Repeats)
+    os.remove("brain0.nndf")
+
+    Stages["brain_build"] = time_call(lambda: build_neural_network(Weights), Repeats)
+    network = build_neural_network(Weights)
+    Stages["matrix_compile"] = time_call(lambda: MATRIX_NEURAL_NETWORK(network=network), Repeats)
+
+    def load():
+        p.resetSimulation()
+        Simulation("DIRECT", "0", Connect=False, Weights=Weights)
+
+    Simulation("DIRECT", "0", Connect=False, Weights=Weights)
+    Stages["load"] = time_call(load, Repeats)
+    return Stages
+
+
+def benchmark_steps(Weights, Runs):
+    """
+    Runs a single Simulation Runs times through Simulation.run with c.PROFILE set, so exactly the hot path of an
+    evaluation is timed, including the c.EARLY_STOPPING_POLICIES. Returns the per-step latency percentiles, the
+    Profiler's total time in each stage and its counters, and the simulated steps per second.
+    """
+    p.resetSimulation()
+    simulation = Simulation("DIRECT", "0", Connect=False, Weights=Weights)
+    Profile = Profiler()
+    StepDurations = []
+    Profiling = c.PROFILE
+    c.PROFILE = True
+    Start = time.perf_counter()
+    for Run in range(Runs):
+        simulation.reset(["0"], [Weights])
+        simulation.run(c.EARLY_STOPPING_POLICIES)
+        Profile.merge(simulation.Profiler.to_dict())
+        StepDurations.extend(simulation.Profiler.StepDurations)
+    Elapsed = time.perf_counter() - Start
+    c.PROFILE = Profiling
+
+    StepTime = sum(StepDurations)
+    return {"runs": Runs,
+            "steps_per_second": Profile.Counters["steps"] / Elapsed,
+            "evaluations_per_second": Runs / Elapsed,
+            "step_latency": summarize(StepDurations),
+            "stage_seconds": Profile.Timers,
+            "stage_fractions": {Stage: Total / StepTime for Stage, Total in Profile.Timers.items()},
+            "counters": Profile.Counters}
+
+
+def benchmark_process_evaluation(Weights, Repeats):
+    """
+    Times the original path of one process per Solution, Solution.evaluate, which starts a multiprocessing.Process
+    running simulate.run_simulation and waits for the fitness to come back through a pipe. Returns the mean seconds
+    per evaluation. On Linux that process is forked from this interpreter, which has already imported everything,
+    so the start-up and import cost of a fresh interpreter is not included; benchmark_cold_start measures it.
+    """
+    def evaluate():
+        solution = Solution(0)
+        solution.Weights = Weights
+        solution.evaluate("DIRECT")
+
+    return time_call(evaluate, Repeats)
+
+
+def benchmark_cold_start(Repeats):
+    """
+    Times fresh interpreters, as started for every spawned evaluation, in three stages: a bare interpreter, importing
+    the simulate.py entry point, and getting a Simulation loaded and ready for its first step. Returns the mean wall
+    time of each in seconds.
+    """
+    Scripts = {"interpreter": "pass",
+               "entry_point_import": "import simulate",
+               "simulation_ready": "import pybullet as p\n"
+                                   "from simulation import Simulation\n"
+                                   "p.connect(p.DIRECT)\n"
+                                   "Simulation('DIRECT', '0', Connect=False, Weights=[[0.0] * "
+                                   + str(c.NUM_MOTOR_NEURONS) + "] * " + str(c.NUM_SENSOR_NEURONS) + ")"}
+    Directory = os.path.dirname(os.path.abspath(__file__))
+    return {Stage: time_call(lambda: subprocess.run([sys.executable, "-c", Script], cwd=Directory, check=True,
+                                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL), Repeats)
+            for Stage, Script in Scripts.items()}
+
+
+def benchmark_afpo(Generations, NumWorkers):
+    """
+    Runs a fixed-seed AFPO search for Generations generations and returns its wall time, the number of Solutions
+    simulated and the evaluations per second, along with the best fitness so runs can be checked for equality.
+    """
+    from AFPO import AFPO
+
+    NumGenerations = c.NUM_GENERATIONS
+    c.NUM_GENERATIONS = Generations
+    Start = time.perf_counter()
+    afpo = AFPO(NumWorkers)
+    afpo.evolve()
+    Elapsed = time.perf_counter() - Start
+    afpo.close()
+    c.NUM_GENERATIONS = NumGenerations
+
+    return {"generations": Generations,
+            "workers": NumWorkers,
+            "seconds": Elapsed,
+            "evaluations": afpo.NextAvailableID,
+            "evaluations_per_second": afpo.NextAvailableID / Elapsed,
+            "best_fitness": float(numpy.min(afpo.Population.Fitnesses))}
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the AFPO evaluation pipeline headless in DIRECT mode.")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the benchmarked genomes and AFPO run")
+    parser.add_argument("--repeats", type=int, default=20, help="repetitions of every setup stage")
+    parser.add_argument("--runs", type=int, default=5, help="complete simulations timed step by step")
+    parser.add_argument("--process-repeats", type=int, default=3,
+                        help="evaluations through Solution.evaluate, 0 to skip")
+    parser.add_argument("--cold-start-repeats", type=int, default=5,
+                        help="fresh interpreters started for every cold start stage, 0 to skip")
+    parser.add_argument("--generations", type=int, default=5, help="AFPO generations, 0 to skip")
+    parser.add_argument("--workers", type=int, default=c.NUM_WORKERS, help="AFPO evaluator worker processes")
+    parser.add_argument("--output", default="benchmark.json", help="file the JSON results are written to")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=c.LOG_LEVEL)
+    c.RANDOM_SEED = args.seed
+    c.CHECKPOINT_FILE = None
+    c.FITNESS_CACHE_FILE = None
+    c.TRACE_DIRECTORY = None
+    Weights = numpy.random.default_rng(args.seed).uniform(-1, 1, (c.NUM_SENSOR_NEURONS, c.NUM_MOTOR_NEURONS))
+
+    Results = {"time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+               "revision": git_revision(),
+               "config": {"seed": args.seed, "num_steps": c.NUM_STEPS, "population_size": c.POPULATION_SIZE,
+                          "batch_size": c.BATCH_SIZE, "neural_network_engine": c.NEURAL_NETWORK_ENGINE,
+                          "reuse_loaded_bodies": c.REUSE_LOADED_BODIES,
+                          "early_stopping_policies": c.EARLY_STOPPING_POLICIES,
+                          "telemetry": c.TELEMETRY_DIRECTORY is not None}}
+
+    p.connect(p.DIRECT)
+    Results["setup_seconds"] = benchmark_setup(Weights, args.repeats)
+    Results["simulation"] = benchmark_steps(Weights, args.runs)
+    p.disconnect()
+
+    if args.cold_start_repeats:
+        Results["cold_start_seconds"] = benchmark_cold_start(args.cold_start_repeats)
+    if args.process_repeats:
+        Results["process_evaluation_seconds"] = benchmark_process_evaluation(Weights, args.process_repeats)
+    if args.generations:
+        Results["afpo"] = benchmark_afpo(args.generations, args.workers)
+
+    with open(args.output, "w") as f:
+        json.dump(Results, f, indent=2)
+    print(json.dumps(Results, indent=2))
@@ -0,0 +1,57 @@
+import numpy
+import constants as c
+from pyrosim.neuralNetwork import NEURAL_NETWORK
+
+
+def lay_out_neural_network(Weights, AddSensorNeuron, AddMotorNeuron, AddSynapse):
+    """
+    Passes the neurons and synapses described by a Solution's Weights to the three given functions, which take the
+    keyword arguments of NEURAL_NETWORK.Add_Sensor_Neuron, Add_Motor_Neuron and Add_Synapse. Sensor neurons 0 to
+    c.NUM_SENSOR_NEURONS - 1 come first, followed by one motor neuron per joint in c.MOTOR_JOINT_NAMES, with every
+    sensor connected to every motor.
+    """
+    for SensorNeuron, LinkName in enumerate(c.SENSOR_LINK_NAMES):
+        AddSensorNeuron(name=SensorNeuron, linkName=LinkName)
+
+    for MotorNeuron, JointName in enumerate(c.MOTOR_JOINT_NAMES):
+        AddMotorNeuron(name=MotorNeuron + c.NUM_SENSOR_NEURONS, jointName=JointName)
+
+    for currentRow in range(0, c.NUM_SENSOR_NEURONS):
+        for currentCol in range(0, c.NUM_MOTOR_NEURONS):
+            AddSynapse(sourceNeuronName=currentRow, targetNeuronName=currentCol + c.NUM_SENSOR_NEURONS,
+                       weight=Weights[currentRow][currentCol])
+
+
+def build_neural_network(Weights):
+    """
+    Builds the NEURAL_NETWORK described by a Solution's Weights directly in memory, see lay_out_neural_network.
+    """
+    network = NEURAL_NETWORK()
+    lay_out_neural_network(Weights, network.Add_Sensor_Neuron, network.Add_Motor_Neuron, network.Add_Synapse)
+    return network
+
+
+def export_neural_network(SolutionID, Weights):
+    """
+    Writes the neural network described by a Solution's Weights to brain<SolutionID>.nndf, with the same layout as
+    build_neural_network. Simulations never read this file, it is only written for debugging when c.EXPORT_NNDF is
+    set.
+    """
+    from pyrosim.writer import NNDF_WRITER
+
+    with NNDF_WRITER("brain" + str(SolutionID) + ".nndf") as writer:
+        lay_out_neural_network(Weights, writer.Send_Sensor_Neuron, writer.Send_Motor_Neuron, writer.Send_Synapse)
+
+
+def weights_to_bytes(Weights):
+    """
+    Serializes a Weights matrix into the byte buffer sent to simulation workers.
+    """
+    return numpy.ascontiguousarray(Weights, dtype=numpy.float64).tobytes()
+
+
+def weights_from_bytes(Buffer):
+    """
+    Rebuilds the Weights matrix from a byte buffer produced by weights_to_bytes.
+    """
+    return numpy.frombuffer(Buffer, dtype=numpy.float64).reshape(c.NUM_SENSOR_NEURONS, c.NUM_MOTOR_NEURONS)
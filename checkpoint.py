@@ -0,0 +1,40 @@
+import json
+import os
+import numpy
+
+
+def save_checkpoint(FileName, afpo):
+    """
+    Writes the full state of an AFPO run to FileName as a single .npz file: the population arrays, the ID counter,
+    the generation counter and the state of the population's random number generator. The file is written under a
+    temporary name and renamed into place, so a run killed while saving still leaves the previous checkpoint intact.
+    """
+    population = afpo.Population
+    GeneratorState = json.dumps(population.Generator.bit_generator.state).encode()
+    TemporaryFileName = FileName + ".tmp.npz"
+    numpy.savez(TemporaryFileName,
+                Genomes=population.Genomes,
+                IDs=population.IDs,
+                Ages=population.Ages,
+                Fitnesses=population.Fitnesses,
+                Stopped=population.Stopped,
+                NextAvailableID=afpo.NextAvailableID,
+                Generation=afpo.Generation,
+                GeneratorState=numpy.frombuffer(GeneratorState, dtype=numpy.uint8))
+    os.replace(TemporaryFileName, FileName)
+
+
+def load_checkpoint(FileName, afpo):
+    """
+    Restores the state saved by save_checkpoint into afpo, so evolve() continues from the saved generation.
+    """
+    Data = numpy.load(FileName)
+    population = afpo.Population
+    population.Genomes = Data["Genomes"]
+    population.IDs = Data["IDs"]
+    population.Ages = Data["Ages"]
+    population.Fitnesses = Data["Fitnesses"]
+    population.Stopped = Data["Stopped"]
+    population.Generator.bit_generator.state = json.loads(Data["GeneratorState"].tobytes().decode())
+    afpo.NextAvailableID = int(Data["NextAvailableID"])
+    afpo.Generation = int(Data["Generation"])
@@ -1,21 +1,62 @@
 import numpy
+import os
 
 NUM_STEPS = 1000
-FRONT_LEG_AMPLITUDE = numpy.pi / 10
-FRONT_LEG_FREQUENCY = 10
-FRONT_LEG_PHASE_OFFSET = numpy.pi
-BACK_LEG_AMPLITUDE = numpy.pi / 4
-BACK_LEG_FREQUENCY = 10
-BACK_LEG_PHASE_OFFSET = 0
 
 FORCE_AMOUNT = 50
 SLEEP_AMOUNT = 1 / 60
 
 NUM_GENERATIONS = 1
+CHECKPOINT_FILE = "checkpoint.npz"
+CHECKPOINT_INTERVAL = 10
 POPULATION_SIZE = 10
 NUM_INDIVIDUALS_ADDED_PER_GENERATION = 1
+RANDOM_SEED = None
 
 NUM_SENSOR_NEURONS = 8
 NUM_MOTOR_NEURONS = 4
+SENSOR_LINK_NAMES = ["BackLeg", "BackLowerLeg", "FrontLeg", "FrontLowerLeg", "LeftLeg", "LeftLowerLeg", "RightLeg",
+                     "RightLowerLeg"]
+MOTOR_JOINT_NAMES = ["BackLeg_BackLowerLeg", "FrontLeg_FrontLowerLeg", "LeftLeg_LeftLowerLeg", "RightLeg_RightLowerLeg"]
+EXPORT_NNDF = False
+NEURAL_NETWORK_ENGINE = "matrix"
 
-MOTOR_JOINT_RANGE = 0.2
\ No newline at end of file
+MUTATION_RATE = 1 / (NUM_SENSOR_NEURONS * NUM_MOTOR_NEURONS)
+MUTATION_SIGMA = 0.5
+MUTATION_MODE = "gaussian"
+
+MOTOR_JOINT_RANGE = 0.2
+
+NUM_WORKERS = os.cpu_count()
+BATCH_SIZE = 1
+BATCH_SPACING = 10
+REUSE_LOADED_BODIES = True
+WORKER_POLL_INTERVAL = 1
+WORKER_TASK_RETRIES = 1
+WORKER_STALL_TIMEOUT = 600
+
+EVALUATION_BACKEND = "local"
+DISTRIBUTED_HOST = "localhost"
+DISTRIBUTED_PORT = 6000
+DISTRIBUTED_AUTHKEY = None
+DISTRIBUTED_TASK_TIMEOUT = 600
+DISTRIBUTED_LOCAL_WORKERS = 0
+
+EARLY_STOPPING_POLICIES = []
+EARLY_STOPPING_INTERVAL = 10
+FALLEN_TILT = numpy.pi / 2
+STALL_STEPS = 200
+STALL_DISTANCE = 0.01
+MAX_SPEED_PER_STEP = 0.01
+
+LOG_LEVEL = "WARNING"
+TRACE_DIRECTORY = None
+TRACE_SAMPLE_INTERVAL = 10
+TELEMETRY_DIRECTORY = None
+TELEMETRY_STEPS = None
+PROFILE = False
+
+ASSET_CACHE_DIRECTORY = "assets"
+
+FITNESS_CACHE_SIZE = 100000
+FITNESS_CACHE_FILE = None
@@ -0,0 +1,289 @@
+import argparse
+import ipaddress
+import logging
+import os
+import queue
+import secrets
+import socket
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client
+import constants as c
+from evaluator import Evaluator, run_task
+from profiler import Profiler
+
+AUTHKEY_VARIABLE = "AFPO_AUTHKEY"
+
+
+class Coordinator(Evaluator):
+    """
+    The Coordinator class farms genomes out to simulation workers connected over TCP, which may run on other
+    machines. It is used exactly like the Evaluator, so AFPO does not change. Each worker is served by its own
+    thread that sends one task at a time and waits for its results. When a worker disconnects, or sends nothing back
+    within c.DISTRIBUTED_TASK_TIMEOUT seconds, its task is queued again for the remaining workers, up to
+    c.WORKER_TASK_RETRIES times like in the Evaluator. Waiting for results with no worker connected for longer than
+    c.DISTRIBUTED_TASK_TIMEOUT seconds raises a RuntimeError.
+    Coordinator and workers exchange pickled data, so both authenticate with the key returned by get_authkey. Without
+    a key the Coordinator only listens on a loopback address, with a random key handed to its local workers, and
+    only when it starts some.
+    ...
+
+    Parameters
+    __________
+    Host : str
+        Address the Coordinator listens on, defaults to c.DISTRIBUTED_HOST
+
+    Port : int
+        Port the Coordinator listens on, defaults to c.DISTRIBUTED_PORT. 0 picks a free port
+
+    LocalWorkers : int
+        Number of worker processes to start on this machine, defaults to c.DISTRIBUTED_LOCAL_WORKERS
+
+    BatchSize : int
+        Number of genomes sent to a worker in each task, defaults to c.BATCH_SIZE
+
+    Attributes
+    __________
+    Listener : multiprocessing.connection.Listener
+        Accepts worker connections, authenticated with the key returned by get_authkey
+
+    Address : tuple
+        (host, port) the Coordinator actually listens on
+
+    TaskQueue : queue.Queue
+        Holds (TaskNumber, (config digest, Target, batch of (ID, serialized Weights) genomes)) tasks waiting to be
+        sent to a worker
+
+    ResultQueue : queue.Queue
+        Holds (ID, Fitness, Stopped, Error, Profile) tuples received from the workers
+
+    Lost : queue.Queue
+        Numbers of the tasks whose worker was lost, waiting to be queued again by check_workers
+
+    LastConnected : float
+        time.monotonic value at which a worker was last connected, or nothing was waited for
+
+    Profile : Profiler
+        Sum of the Profiler totals of every result collected since the last take_profile()
+
+    Connections : Connection array
+        Connections of the workers currently attached
+
+    LocalProcesses : Popen array
+        Worker processes started on this machine
+
+    Methods
+    ________
+    accept_workers()
+        Accepts worker connections until the Coordinator is closed
+
+    serve_worker(Connection)
+        Sends tasks to one worker and collects its results, handing the task to Lost if the worker is lost
+
+    dispatch()
+        Moves the queued tasks onto TaskQueue, where the serve_worker threads take them from
+
+    receive()
+        Moves the results on ResultQueue to Results, waiting up to c.WORKER_POLL_INTERVAL seconds for the first
+
+    check_workers()
+        Queues the tasks in Lost again, see Evaluator.requeue, and raises a RuntimeError when results are awaited but
+        no worker was connected for c.DISTRIBUTED_TASK_TIMEOUT seconds
+
+    capacity()
+        Returns the number of workers currently connected, at least 1
+
+    close()
+        Tells every worker to exit and stops listening
+    """
+    def __init__(self, Host=None, Port=None, LocalWorkers=None, BatchSize=None):
+        if Host is None:
+            Host = c.DISTRIBUTED_HOST
+        if Port is None:
+            Port = c.DISTRIBUTED_PORT
+        if LocalWorkers is None:
+            LocalWorkers = c.DISTRIBUTED_LOCAL_WORKERS
+        if BatchSize is None:
+            BatchSize = c.BATCH_SIZE
+
+        self.BatchSize = max(1, BatchSize)
+        self.TaskQueue = queue.Queue()
+        self.ResultQueue = queue.Queue()
+        self.Lost = queue.Queue()
+        self.LastConnected = time.monotonic()
+        self.Profile = Profiler()
+        self.clear_tasks()
+        self.Connections = []
+        self.Lock = threading.Lock()
+        AuthKey = get_authkey()
+        Environment = None
+        if AuthKey is None:
+            if not is_loopback(Host):
+                raise ValueError("Refusing to listen on " + str(Host) + " without a key: set the " + AUTHKEY_VARIABLE
+                                 + " environment variable or c.DISTRIBUTED_AUTHKEY on the coordinator and workers")
+            if LocalWorkers == 0:
+                raise ValueError("Without a key only local workers can connect, but none are started: set the "
+                                 + AUTHKEY_VARIABLE + " environment variable or c.DISTRIBUTED_AUTHKEY, or "
+                                 "c.DISTRIBUTED_LOCAL_WORKERS")
+            AuthKey = secrets.token_hex(32).encode()
+            Environment = dict(os.environ)
+            Environment[AUTHKEY_VARIABLE] = AuthKey.decode()
+        self.Listener = Listener((Host, Port), authkey=AuthKey)
+        self.Address = self.Listener.address
+        threading.Thread(target=self.accept_workers, daemon=True).start()
+
+        self.LocalProcesses = []
+        for x in range(LocalWorkers):
+            self.LocalProcesses.append(subprocess.Popen([sys.executable, __file__, "worker", "--host",
+                                                         str(self.Address[0]), "--port", str(self.Address[1])],
+                                                        env=Environment))
+
+    def accept_workers(self):
+        while True:
+            try:
+                Connection = self.Listener.accept()
+            except AuthenticationError as Error:
+                logging.getLogger(__name__).warning("Rejected a worker (%r)", Error)
+                continue
+            except OSError:
+                break
+            with self.Lock:
+                self.Connections.append(Connection)
+            threading.Thread(target=self.serve_worker, args=(Connection,), daemon=True).start()
+
+    def serve_worker(self, Connection):
+        while True:
+            Item = self.TaskQueue.get()
+            try:
+                if Item is None:
+                    Connection.send(None)
+                    break
+                Connection.send(Item[1])
+                if not Connection.poll(c.DISTRIBUTED_TASK_TIMEOUT):
+                    raise TimeoutError("worker did not answer")
+                Results = Connection.recv()
+            except (EOFError, OSError, TimeoutError) as Error:
+                logging.getLogger(__name__).warning("Lost a worker (%r), re-queueing its task", Error)
+                if Item is not None:
+                    self.Lost.put(Item[0])
+                break
+
+            for Result in Results:
+                self.ResultQueue.put(Result)
+
+        with self.Lock:
+            self.Connections.remove(Connection)
+        Connection.close()
+
+    def dispatch(self):
+        while self.Queued:
+            TaskNumber = self.Queued.popleft()
+            if TaskNumber in self.Tasks:
+                self.TaskQueue.put((TaskNumber, self.Tasks[TaskNumber]))
+
+    def receive(self):
+        self.dispatch()
+        try:
+            self.Results.append(self.ResultQueue.get(timeout=c.WORKER_POLL_INTERVAL))
+            while True:
+                self.Results.append(self.ResultQueue.get_nowait())
+        except queue.Empty:
+            pass
+        self.check_workers()
+        self.dispatch()
+
+    def check_workers(self):
+        while True:
+            try:
+                self.requeue(self.Lost.get_nowait())
+            except queue.Empty:
+                break
+
+        with self.Lock:
+            Connected = len(self.Connections)
+        Now = time.monotonic()
+        if Connected or not self.TaskOf:
+            self.LastConnected = Now
+        elif Now - self.LastConnected > c.DISTRIBUTED_TASK_TIMEOUT:
+            raise RuntimeError("No worker has been connected to " + str(self.Address) + " for "
+                               + str(c.DISTRIBUTED_TASK_TIMEOUT) + " seconds")
+
+    def capacity(self):
+        with self.Lock:
+            return max(1, len(self.Connections))
+
+    def close(self):
+        with self.Lock:
+            Count = len(self.Connections)
+        for x in range(Count):
+            self.TaskQueue.put(None)
+        for Process in self.LocalProcesses:
+            Process.wait()
+        self.LocalProcesses = []
+        self.Listener.close()
+
+
+def get_authkey():
+    """
+    Returns the key the Coordinator and its workers authenticate with: c.DISTRIBUTED_AUTHKEY, or when that is None
+    the value of the AUTHKEY_VARIABLE environment variable. Returns None when neither is set.
+    """
+    if c.DISTRIBUTED_AUTHKEY is not None:
+        return c.DISTRIBUTED_AUTHKEY
+    AuthKey = os.environ.get(AUTHKEY_VARIABLE)
+    if not AuthKey:
+        return None
+    return AuthKey.encode()
+
+
+def is_loopback(Host):
+    """
+    Returns True if Host resolves to a loopback address, so only processes on this machine can connect to it.
+    """
+    try:
+        return ipaddress.ip_address(socket.gethostbyname(Host)).is_loopback
+    except (OSError, ValueError):
+        return False
+
+
+def run_worker(Host, Port):
+    """
+    Connects to a Coordinator and simulates the tasks it sends until it sends None, reusing a single DIRECT
+    physics client for every task.
+    """
+    import pybullet as p
+
+    AuthKey = get_authkey()
+    if AuthKey is None:
+        raise ValueError("Set the " + AUTHKEY_VARIABLE + " environment variable or c.DISTRIBUTED_AUTHKEY to the "
+                         "key of the coordinator")
+    Connection = Client((Host, Port), authkey=AuthKey)
+    p.connect(p.DIRECT)
+    simulation = None
+    while True:
+        try:
+            Task = Connection.recv()
+        except EOFError:
+            break
+        if Task is None:
+            break
+
+        Results, simulation = run_task(Task, simulation)
+        Connection.send(Results)
+
+    Connection.close()
+    p.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Distributed AFPO simulation worker.")
+    parser.add_argument("role", choices=["worker"])
+    parser.add_argument("--host", default=c.DISTRIBUTED_HOST)
+    parser.add_argument("--port", type=int, default=c.DISTRIBUTED_PORT)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=c.LOG_LEVEL)
+    run_worker(args.host, args.port)
@@ -0,0 +1,88 @@
+import pybullet as p
+import numpy
+import constants as c
+
+EarlyStoppingPolicies = {}
+
+
+def register_policy(Name, Policy):
+    """
+    Registers an early-stopping policy class under Name so it can be enabled through c.EARLY_STOPPING_POLICIES.
+    Policy is called as Policy(Target) once per Robot per simulation and must provide should_stop(Robot, Step).
+    """
+    EarlyStoppingPolicies[Name] = Policy
+
+
+def create_policies(Names, Target=None):
+    """
+    Returns a fresh instance of every registered policy listed in Names.
+    """
+    return [EarlyStoppingPolicies[Name](Target) for Name in Names]
+
+
+class EarlyStoppingPolicy:
+    """
+    Base class for early-stopping policies. Simulation.run asks each policy every c.EARLY_STOPPING_INTERVAL steps
+    whether the evaluation of a Robot is hopeless and may be cut short.
+    ...
+
+    Parameters
+    __________
+    Target : float
+        Best fitness on the current AFPO Pareto front, None when no Solution has been evaluated yet
+
+    Methods
+    ________
+    should_stop(Robot, Step)
+        Returns True when the simulation of Robot should stop after Step
+    """
+    def __init__(self, Target=None):
+        self.Target = Target
+
+    def should_stop(self, Robot, Step):
+        return False
+
+
+class FallenPolicy(EarlyStoppingPolicy):
+    """
+    Stops a Robot whose torso has tipped further than c.FALLEN_TILT from upright.
+    """
+    def should_stop(self, Robot, Step):
+        Position, Orientation = p.getBasePositionAndOrientation(Robot.Robot)
+        UpComponent = p.getMatrixFromQuaternion(Orientation)[8]
+        return UpComponent < numpy.cos(c.FALLEN_TILT)
+
+
+class StalledPolicy(EarlyStoppingPolicy):
+    """
+    Stops a Robot that has not moved further than c.STALL_DISTANCE during the last c.STALL_STEPS steps.
+    """
+    def __init__(self, Target=None):
+        EarlyStoppingPolicy.__init__(self, Target)
+        self.AnchorPosition = None
+        self.AnchorStep = 0
+
+    def should_stop(self, Robot, Step):
+        Position = numpy.array(p.getLinkState(Robot.Robot, 0)[0][:2])
+        if self.AnchorPosition is None or numpy.linalg.norm(Position - self.AnchorPosition) > c.STALL_DISTANCE:
+            self.AnchorPosition = Position
+            self.AnchorStep = Step
+            return False
+        return Step - self.AnchorStep >= c.STALL_STEPS
+
+
+class UnreachablePolicy(EarlyStoppingPolicy):
+    """
+    Stops a Robot that can no longer beat Target in the steps left, even when moving at c.MAX_SPEED_PER_STEP.
+    Lower fitness values are better.
+    """
+    def should_stop(self, Robot, Step):
+        if self.Target is None:
+            return False
+        StepsLeft = c.NUM_STEPS - Step - 1
+        return Robot.compute_fitness() - StepsLeft * c.MAX_SPEED_PER_STEP > self.Target
+
+
+register_policy("fallen", FallenPolicy)
+register_policy("stalled", StalledPolicy)
+register_policy("unreachable", UnreachablePolicy)
@@ -0,0 +1,401 @@
+import collections
+import logging
+import multiprocessing
+import multiprocessing.connection
+import time
+import traceback
+import numpy
+import constants as c
+from brain import weights_to_bytes, export_neural_network
+from profiler import Profiler
+
+logger = logging.getLogger(__name__)
+
+
+def task_config_digest():
+    """
+    Returns a digest of every setting a worker simulates a task with: the settings of
+    fitnesscache.simulation_config_digest plus the early-stopping settings. It is sent with every task, so a worker
+    whose constants differ from the ones the task was submitted with rejects it instead of returning fitness values
+    simulated under other settings.
+    """
+    import hashlib
+    from fitnesscache import simulation_config_digest
+
+    Config = (simulation_config_digest(), c.EARLY_STOPPING_POLICIES, c.EARLY_STOPPING_INTERVAL, c.FALLEN_TILT,
+              c.STALL_STEPS, c.STALL_DISTANCE, c.MAX_SPEED_PER_STEP)
+    return hashlib.blake2b(repr(Config).encode(), digest_size=16).digest()
+
+
+def run_task(Task, simulation):
+    """
+    Simulates one task, a (config digest, Target, batch of (ID, serialized Weights) genomes) tuple, in the already
+    connected DIRECT physics client. A task whose config digest differs from this process's task_config_digest() is
+    rejected with an error result for every genome. All genomes of a batch are simulated together in one
+    BatchSimulation. When c.REUSE_LOADED_BODIES is set, the BatchSimulation of the previous task is reset to its saved
+    state instead of being loaded again if it holds the same number of Robots. Every Robot is checked against the
+    c.EARLY_STOPPING_POLICIES, using the Target fitness sent along with the batch.
+
+    Returns the list of (ID, Fitness, Stopped, Error, Profile) results and the BatchSimulation to pass to the next
+    call. When c.PROFILE is set the first result carries the Profiler totals of the whole batch, including the time
+    taken to load or reset it, as a dictionary. Profile is None otherwise.
+    """
+    import pybullet as p
+    from simulation import BatchSimulation
+    from brain import weights_from_bytes
+
+    ConfigDigest, Target, Genomes = Task
+    SolutionIDs = [SolutionID for SolutionID, WeightsBuffer in Genomes]
+    if ConfigDigest != task_config_digest():
+        Error = "The worker's simulation settings differ from the ones the task was submitted with\n"
+        return [(SolutionID, None, False, Error, None) for SolutionID in SolutionIDs], simulation
+    try:
+        Start = time.perf_counter()
+        WeightsList = [weights_from_bytes(WeightsBuffer) for SolutionID, WeightsBuffer in Genomes]
+        if c.REUSE_LOADED_BODIES and simulation is not None and len(simulation.Robots) == len(Genomes):
+            simulation.reset(SolutionIDs, WeightsList)
+        else:
+            simulation = None
+            p.resetSimulation()
+            simulation = BatchSimulation("DIRECT", [str(SolutionID) for SolutionID in SolutionIDs],
+                                         Connect=False, WeightsList=WeightsList)
+        Setup = time.perf_counter() - Start
+        simulation.run(c.EARLY_STOPPING_POLICIES, Target)
+        Profiles = [None] * len(SolutionIDs)
+        if simulation.Profiler is not None:
+            simulation.Profiler.add("setup", Setup)
+            Profiles[0] = simulation.Profiler.to_dict()
+        Results = [(SolutionID, robot.compute_fitness(), robot.Stopped, None, Profile)
+                   for SolutionID, robot, Profile in zip(SolutionIDs, simulation.Robots, Profiles)]
+        return Results, simulation
+    except Exception:
+        Error = traceback.format_exc()
+        return [(SolutionID, None, False, Error, None) for SolutionID in SolutionIDs], None
+
+
+def worker_loop(Connection):
+    """
+    Runs inside each long-lived worker process. A single DIRECT pybullet client is opened once and reused for
+    every task received on Connection, see run_task, and the results of each task are sent back on it. A None task,
+    or the Evaluator closing its end, shuts the worker down.
+    """
+    import pybullet as p
+
+    logging.basicConfig(level=c.LOG_LEVEL)
+    p.connect(p.DIRECT)
+    simulation = None
+    while True:
+        try:
+            Task = Connection.recv()
+        except EOFError:
+            break
+        if Task is None:
+            break
+
+        Results, simulation = run_task(Task, simulation)
+        Connection.send(Results)
+
+    Connection.close()
+    p.disconnect()
+
+
+class Evaluator:
+    """
+    The Evaluator class keeps a pool of long-lived worker processes that simulate Solutions and return their
+    fitness values directly, so no individual pays for a fresh interpreter, pybullet import and p.connect. Each
+    worker has its own Pipe and is handed one task at a time, so the Evaluator always knows which task every worker
+    holds. A worker that dies, or holds its task for longer than c.WORKER_STALL_TIMEOUT seconds, is restarted and
+    its task is queued again.
+    ...
+
+    Parameters
+    __________
+    NumWorkers : int
+        Number of worker processes, defaults to c.NUM_WORKERS
+
+    BatchSize : int
+        Number of genomes simulated together in one physics client, defaults to c.BATCH_SIZE
+
+    Attributes
+    __________
+    BatchSize : int
+        Number of genomes sent to a worker in each task
+
+    Profile : Profiler
+        Sum of the Profiler totals of every result collected since the last take_profile(), empty unless c.PROFILE
+        is set
+
+    Workers : Process array
+        The worker processes, each with its own DIRECT pybullet client
+
+    Pipes : Connection array
+        The Evaluator's end of the Pipe of every worker
+
+    Claims : list
+        Number of the task each worker is simulating, None when it is idle. A claim is only cleared once the
+        Evaluator has received the task's results
+
+    ClaimTimes : list
+        time.monotonic value at which each worker was handed its current task
+
+    Tasks : dict
+        Every submitted (config digest, Target, batch of (ID, serialized Weights) genomes) task whose results have
+        not all been collected, by task number
+
+    TaskOf : dict
+        Number of the task of every genome whose result has not been collected yet, by ID
+
+    Retries : dict
+        Number of times each task was queued again after losing its worker, by task number
+
+    Queued : deque
+        Numbers of the tasks waiting for an idle worker, in order
+
+    Results : deque
+        (ID, Fitness, Stopped, Error, Profile) results received but not collected yet
+
+    Methods
+    ________
+    start_worker(Index)
+        Starts the worker process at Index of Workers, with a new Pipe
+
+    clear_tasks()
+        Forgets every submitted task and result
+
+    evaluate_genomes(IDs, Genomes, Target)
+        Simulates every genome in the worker pool and returns the arrays of fitness values and early-stopped flags.
+        Target is the best fitness on the current Pareto front, used by the early-stopping policies
+
+    submit(IDs, Genomes, Target)
+        Queues the genomes for simulation and returns without waiting for them. When c.EXPORT_NNDF is set each
+        genome's brain is also written to brain<ID>.nndf for debugging
+
+    dispatch()
+        Hands queued tasks to the idle workers
+
+    receive()
+        Waits up to c.WORKER_POLL_INTERVAL seconds for results from the workers, then checks the workers
+
+    receive_from(Index)
+        Reads the results of the worker at Index and clears its claim, unless its Pipe broke before they arrived
+
+    collect()
+        Waits for the next simulated genome, in whatever order the workers finish, and returns its ID, fitness and
+        early-stopped flag
+
+    check_workers()
+        Restarts every worker that died or stalled and queues its task again, see requeue
+
+    requeue(TaskNumber)
+        Queues a task that lost its worker again, up to c.WORKER_TASK_RETRIES times. After that every genome of the
+        task fails, so collect() raises a RuntimeError
+
+    discard(IDs)
+        Stops waiting for the results of IDs, which are dropped if they still arrive
+
+    capacity()
+        Returns the number of tasks the workers can simulate at once
+
+    take_profile()
+        Returns the summed Profiler totals as a dictionary and starts a new sum
+
+    evaluate(Solutions, Target)
+        Simulates every Solution in the worker pool and assigns each its Fitness, and whether it was Stopped early
+
+    close()
+        Stops all worker processes
+    """
+    def __init__(self, NumWorkers=None, BatchSize=None):
+        if NumWorkers is None:
+            NumWorkers = c.NUM_WORKERS
+        if BatchSize is None:
+            BatchSize = c.BATCH_SIZE
+
+        self.BatchSize = max(1, BatchSize)
+        self.Profile = Profiler()
+        self.clear_tasks()
+        NumWorkers = max(1, NumWorkers)
+        self.Workers = [None] * NumWorkers
+        self.Pipes = [None] * NumWorkers
+        self.Claims = [None] * NumWorkers
+        self.ClaimTimes = [None] * NumWorkers
+        for x in range(NumWorkers):
+            self.start_worker(x)
+
+    def start_worker(self, Index):
+        Pipe, WorkerPipe = multiprocessing.Pipe()
+        worker = multiprocessing.Process(target=worker_loop, args=(WorkerPipe,), daemon=True)
+        worker.start()
+        WorkerPipe.close()
+        self.Workers[Index] = worker
+        self.Pipes[Index] = Pipe
+        self.Claims[Index] = None
+
+    def clear_tasks(self):
+        self.Tasks = {}
+        self.TaskOf = {}
+        self.Retries = {}
+        self.NextTaskNumber = 0
+        self.Queued = collections.deque()
+        self.Results = collections.deque()
+
+    def evaluate_genomes(self, IDs, Genomes, Target=None):
+        Fitnesses = numpy.zeros(len(IDs))
+        Stopped = numpy.zeros(len(IDs), dtype=bool)
+        Positions = {}
+        for x, SolutionID in enumerate(IDs):
+            Positions[int(SolutionID)] = x
+
+        self.submit(IDs, Genomes, Target)
+        try:
+            while Positions:
+                SolutionID, Fitness, WasStopped = self.collect()
+                Position = Positions.pop(SolutionID)
+                Fitnesses[Position] = Fitness
+                Stopped[Position] = WasStopped
+        except BaseException:
+            self.discard(list(Positions))
+            raise
+
+        return Fitnesses, Stopped
+
+    def submit(self, IDs, Genomes, Target=None):
+        if c.EXPORT_NNDF:
+            for SolutionID, Weights in zip(IDs, Genomes):
+                export_neural_network(int(SolutionID), Weights)
+        ConfigDigest = task_config_digest()
+        for x in range(0, len(IDs), self.BatchSize):
+            Task = (ConfigDigest, Target, [(int(IDs[y]), weights_to_bytes(Genomes[y]))
+                             for y in range(x, min(x + self.BatchSize, len(IDs)))])
+            TaskNumber = self.NextTaskNumber
+            self.NextTaskNumber += 1
+            self.Tasks[TaskNumber] = Task
+            self.Retries[TaskNumber] = 0
+            for SolutionID, WeightsBuffer in Task[2]:
+                self.TaskOf[SolutionID] = TaskNumber
+            self.Queued.append(TaskNumber)
+        self.dispatch()
+
+    def dispatch(self):
+        for Index in range(len(self.Workers)):
+            while self.Queued and self.Queued[0] not in self.Tasks:
+                self.Queued.popleft()
+            if not self.Queued:
+                break
+            if self.Claims[Index] is not None:
+                continue
+
+            TaskNumber = self.Queued.popleft()
+            try:
+                self.Pipes[Index].send(self.Tasks[TaskNumber])
+            except OSError:
+                self.Queued.appendleft(TaskNumber)
+                continue
+            self.Claims[Index] = TaskNumber
+            self.ClaimTimes[Index] = time.monotonic()
+
+    def receive(self):
+        self.dispatch()
+        Busy = [Index for Index in range(len(self.Workers)) if self.Claims[Index] is not None]
+        Ready = multiprocessing.connection.wait([self.Pipes[Index] for Index in Busy]
+                                                + [worker.sentinel for worker in self.Workers],
+                                                c.WORKER_POLL_INTERVAL)
+        for Index in Busy:
+            if self.Pipes[Index] in Ready:
+                self.receive_from(Index)
+        self.check_workers()
+        self.dispatch()
+
+    def receive_from(self, Index):
+        try:
+            Results = self.Pipes[Index].recv()
+        except (EOFError, OSError):
+            return
+        self.Claims[Index] = None
+        self.Results.extend(Results)
+
+    def collect(self):
+        while True:
+            if not self.Results:
+                self.receive()
+                continue
+            SolutionID, Fitness, WasStopped, Error, Profile = self.Results.popleft()
+            if SolutionID in self.TaskOf:
+                break
+
+        self.discard([SolutionID])
+        if Error is not None:
+            raise RuntimeError("Simulation of solution " + str(SolutionID) + " failed:\n" + Error)
+        if Profile is not None:
+            self.Profile.merge(Profile)
+        return SolutionID, Fitness, WasStopped
+
+    def check_workers(self):
+        Now = time.monotonic()
+        for Index, worker in enumerate(self.Workers):
+            if worker.is_alive():
+                if self.Claims[Index] is None or Now - self.ClaimTimes[Index] < c.WORKER_STALL_TIMEOUT:
+                    continue
+                logger.warning("Worker %d held its task for %d seconds, restarting it", Index,
+                               Now - self.ClaimTimes[Index])
+                worker.kill()
+                worker.join()
+            else:
+                logger.warning("Worker %d exited with code %s, restarting it", Index, worker.exitcode)
+                if self.Claims[Index] is not None and self.Pipes[Index].poll():
+                    self.receive_from(Index)
+
+            TaskNumber = self.Claims[Index]
+            self.Pipes[Index].close()
+            self.start_worker(Index)
+            if TaskNumber is not None:
+                self.requeue(TaskNumber)
+
+    def requeue(self, TaskNumber):
+        if TaskNumber not in self.Tasks:
+            return
+        if self.Retries[TaskNumber] < c.WORKER_TASK_RETRIES:
+            self.Retries[TaskNumber] += 1
+            self.Queued.appendleft(TaskNumber)
+            return
+
+        Error = "The task lost its worker " + str(self.Retries[TaskNumber] + 1) + " times\n"
+        for SolutionID, WeightsBuffer in self.Tasks[TaskNumber][2]:
+            self.Results.append((SolutionID, None, False, Error, None))
+
+    def discard(self, IDs):
+        for SolutionID in IDs:
+            TaskNumber = self.TaskOf.pop(int(SolutionID), None)
+            if TaskNumber is None:
+                continue
+            if not any(self.TaskOf.get(OtherID) == TaskNumber for OtherID, WeightsBuffer in self.Tasks[TaskNumber][2]):
+                del self.Tasks[TaskNumber]
+                del self.Retries[TaskNumber]
+
+    def capacity(self):
+        return len(self.Workers)
+
+    def take_profile(self):
+        Profile = self.Profile.to_dict()
+        self.Profile.reset()
+        return Profile
+
+    def evaluate(self, Solutions, Target=None):
+        Solutions = list(Solutions)
+        Fitnesses, Stopped = self.evaluate_genomes([solution.MyID for solution in Solutions],
+                                                   [solution.Weights for solution in Solutions], Target)
+        for solution, Fitness, WasStopped in zip(Solutions, Fitnesses, Stopped):
+            solution.Fitness = float(Fitness)
+            solution.Stopped = bool(WasStopped)
+
+    def close(self):
+        for Pipe in self.Pipes:
+            try:
+                Pipe.send(None)
+            except OSError:
+                pass
+        for worker, Pipe in zip(self.Workers, self.Pipes):
+            worker.join()
+            Pipe.close()
+        self.Workers = []
+        self.Pipes = []
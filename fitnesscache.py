@@ -0,0 +1,101 @@
+import collections
+import hashlib
+import os
+import numpy
+import constants as c
+from assets import WORLD_SPEC, BODY_SPEC
+
+
+def simulation_config_digest():
+    """
+    Returns a digest of every setting that changes the fitness a genome is simulated to, so cached fitness values
+    are never reused under a different simulation configuration.
+    """
+    Config = (c.NUM_STEPS, c.NEURAL_NETWORK_ENGINE, c.MOTOR_JOINT_RANGE, c.FORCE_AMOUNT, c.SENSOR_LINK_NAMES,
+              c.MOTOR_JOINT_NAMES, c.BATCH_SIZE, c.BATCH_SPACING, WORLD_SPEC, BODY_SPEC)
+    return hashlib.blake2b(repr(Config).encode(), digest_size=16).digest()
+
+
+class FitnessCache:
+    """
+    The FitnessCache class remembers the fitness of every genome simulated so far, keyed by a hash of its weight
+    matrix and of the simulation configuration, so an identical genome is never simulated twice. The least recently
+    used entries are dropped once MaxSize entries are stored.
+    ...
+
+    Parameters
+    __________
+    MaxSize : int
+        Maximum number of stored fitness values, defaults to c.FITNESS_CACHE_SIZE
+
+    FileName : str
+        .npz file the cache is loaded from and saved to, defaults to c.FITNESS_CACHE_FILE. None keeps the cache in
+        memory only
+
+    Attributes
+    __________
+    Entries : OrderedDict
+        Maps genome keys to fitness values, from least to most recently used
+
+    ConfigDigest : bytes
+        Digest of the simulation configuration, part of every key
+
+    Methods
+    ________
+    key(Genome)
+        Returns the cache key of a genome
+
+    get(Genome)
+        Returns the cached fitness of a genome, or None
+
+    put(Genome, Fitness)
+        Stores the fitness of a genome
+
+    save()
+        Writes the cache to FileName
+    """
+    def __init__(self, MaxSize=None, FileName=None):
+        if MaxSize is None:
+            MaxSize = c.FITNESS_CACHE_SIZE
+        if FileName is None:
+            FileName = c.FITNESS_CACHE_FILE
+
+        self.MaxSize = MaxSize
+        self.FileName = FileName
+        self.ConfigDigest = simulation_config_digest()
+        self.Entries = collections.OrderedDict()
+        if FileName is not None and os.path.exists(FileName):
+            Data = numpy.load(FileName)
+            for Key, Fitness in zip(Data["Keys"], Data["Fitnesses"]):
+                self.Entries[Key.tobytes()] = float(Fitness)
+
+    def __len__(self):
+        return len(self.Entries)
+
+    def key(self, Genome):
+        Weights = numpy.ascontiguousarray(Genome, dtype=numpy.float64)
+        return hashlib.blake2b(Weights.tobytes() + self.ConfigDigest, digest_size=16).digest()
+
+    def get(self, Genome):
+        Key = self.key(Genome)
+        if Key not in self.Entries:
+            return None
+        self.Entries.move_to_end(Key)
+        return self.Entries[Key]
+
+    def put(self, Genome, Fitness):
+        Key = self.key(Genome)
+        self.Entries[Key] = float(Fitness)
+        self.Entries.move_to_end(Key)
+        while len(self.Entries) > self.MaxSize:
+            self.Entries.popitem(last=False)
+
+    def save(self):
+        if self.FileName is None:
+            return
+        Keys = numpy.array([numpy.frombuffer(Key, dtype=numpy.uint8) for Key in self.Entries],
+                           dtype=numpy.uint8).reshape(len(self.Entries), 16)
+        Fitnesses = numpy.array(list(self.Entries.values()))
+        TemporaryFileName = self.FileName + ".tmp.npz"
+        numpy.savez(TemporaryFileName, Keys=Keys, Fitnesses=Fitnesses)
+        os.replace(TemporaryFileName, self.FileName)
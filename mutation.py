@@ -0,0 +1,39 @@
+import numpy
+import constants as c
+
+
+def mutate_genomes(Genomes, Generator, Rate=None, Sigma=None, Mode=None):
+    """
+    Mutates a whole batch of genomes in place with a few NumPy calls, whatever the batch or genome size.
+
+    Every weight of every genome is mutated independently with probability Rate, so the full weight matrix is
+    covered. A genome that drew no mutation gets one randomly chosen weight mutated, so no child is an unchanged
+    copy of its parent. In "gaussian" Mode a mutated weight is perturbed by Gaussian noise of standard deviation Sigma,
+    in "uniform" Mode it is redrawn uniformly, and weights are always kept within [-1, 1].
+
+    Parameters:
+    Genomes : numpy array of shape (genomes, c.NUM_SENSOR_NEURONS, c.NUM_MOTOR_NEURONS)
+    Generator : numpy.random.Generator driving every random draw, seed it for reproducible runs
+    Rate, Sigma, Mode : default to c.MUTATION_RATE, c.MUTATION_SIGMA and c.MUTATION_MODE
+
+    Returns:
+    The boolean mask of mutated weights
+    """
+    if Rate is None:
+        Rate = c.MUTATION_RATE
+    if Sigma is None:
+        Sigma = c.MUTATION_SIGMA
+    if Mode is None:
+        Mode = c.MUTATION_MODE
+
+    Mask = Generator.random(Genomes.shape) < Rate
+    Flat = Mask.reshape(len(Genomes), -1)
+    Unmutated = numpy.flatnonzero(~Flat.any(axis=1))
+    Flat[Unmutated, Generator.integers(0, Flat.shape[1], len(Unmutated))] = True
+
+    if Mode == "gaussian":
+        Genomes[Mask] += Generator.normal(0, Sigma, Mask.sum())
+    else:
+        Genomes[Mask] = Generator.uniform(-1, 1, Mask.sum())
+    numpy.clip(Genomes, -1, 1, out=Genomes)
+    return Mask
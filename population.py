@@ -0,0 +1,122 @@
+import numpy
+import constants as c
+from solution import Solution
+from mutation import mutate_genomes
+
+
+class Population:
+    """
+    The Population class stores every individual of the AFPO population as a row in parallel NumPy arrays instead of
+    as separate Solution objects, so cloning, mutation, ageing and selection are whole-array operations.
+    ...
+
+    Parameters
+    __________
+    Seed : int
+        Seed of the random number generator, defaults to c.RANDOM_SEED. None gives a different run every time
+
+    Attributes
+    __________
+    Generator : numpy.random.Generator
+        Drives every random genome and mutation of the population
+
+    Genomes : numpy array
+        Weights of every individual, shape (individuals, c.NUM_SENSOR_NEURONS, c.NUM_MOTOR_NEURONS)
+
+    IDs : numpy array
+        ID of every individual
+
+    Ages : numpy array
+        Age of every individual
+
+    Fitnesses : numpy array
+        Fitness of every individual, NaN until it has been evaluated
+
+    Stopped : numpy array
+        True for every individual whose last evaluation was stopped early
+
+    Methods
+    ________
+    add_random(IDs)
+        Appends one random individual for each ID
+
+    clone(Indices, IDs)
+        Appends a copy of every individual in Indices, giving the copies the new IDs
+
+    mutate(Indices)
+        Mutates every individual in Indices in one batch, see mutation.mutate_genomes
+
+    breed(Count, RandomFraction)
+        Returns the genomes and ages of Count new individuals without adding them to the population. Each is a
+        mutated copy of a random parent, or with probability RandomFraction a new random individual
+
+    increment_ages()
+        Increases the age of every individual by 1
+
+    select(Indices)
+        Keeps only the individuals in Indices, in that order
+
+    get_solution(Index)
+        Returns the individual at Index as a Solution, e.g. to show it in the GUI
+    """
+    def __init__(self, Seed=None):
+        if Seed is None:
+            Seed = c.RANDOM_SEED
+
+        self.Generator = numpy.random.default_rng(Seed)
+        self.Genomes = numpy.zeros((0, c.NUM_SENSOR_NEURONS, c.NUM_MOTOR_NEURONS))
+        self.IDs = numpy.zeros(0, dtype=int)
+        self.Ages = numpy.zeros(0, dtype=int)
+        self.Fitnesses = numpy.zeros(0)
+        self.Stopped = numpy.zeros(0, dtype=bool)
+
+    def __len__(self):
+        return len(self.IDs)
+
+    def add_random(self, IDs):
+        Genomes = self.Generator.uniform(-1, 1, (len(IDs), c.NUM_SENSOR_NEURONS, c.NUM_MOTOR_NEURONS))
+        self.append(Genomes, IDs, numpy.zeros(len(IDs), dtype=int), numpy.full(len(IDs), numpy.nan),
+                    numpy.zeros(len(IDs), dtype=bool))
+
+    def clone(self, Indices, IDs):
+        self.append(self.Genomes[Indices], IDs, self.Ages[Indices], self.Fitnesses[Indices], self.Stopped[Indices])
+
+    def mutate(self, Indices):
+        Genomes = self.Genomes[Indices]
+        mutate_genomes(Genomes, self.Generator)
+        self.Genomes[Indices] = Genomes
+
+    def breed(self, Count, RandomFraction):
+        Random = self.Generator.random(Count) < RandomFraction
+        Parents = self.Generator.integers(len(self), size=Count)
+        Genomes = self.Genomes[Parents]
+        mutate_genomes(Genomes, self.Generator)
+        Genomes[Random] = self.Generator.uniform(-1, 1, (numpy.count_nonzero(Random), c.NUM_SENSOR_NEURONS,
+                                                         c.NUM_MOTOR_NEURONS))
+        Ages = numpy.where(Random, 0, self.Ages[Parents])
+        return Genomes, Ages
+
+    def increment_ages(self):
+        self.Ages += 1
+
+    def select(self, Indices):
+        self.Genomes = self.Genomes[Indices]
+        self.IDs = self.IDs[Indices]
+        self.Ages = self.Ages[Indices]
+        self.Fitnesses = self.Fitnesses[Indices]
+        self.Stopped = self.Stopped[Indices]
+
+    def get_solution(self, Index):
+        solution = Solution(int(self.IDs[Index]))
+        solution.Weights = self.Genomes[Index].copy()
+        solution.MyAge = int(self.Ages[Index])
+        solution.Fitness = float(self.Fitnesses[Index])
+        solution.Stopped = bool(self.Stopped[Index])
+        return solution
+
+    def append(self, Genomes, IDs, Ages, Fitnesses, Stopped):
+        self.Genomes = numpy.concatenate((self.Genomes, Genomes))
+        self.IDs = numpy.concatenate((self.IDs, IDs))
+        self.Ages = numpy.concatenate((self.Ages, Ages))
+        self.Fitnesses = numpy.concatenate((self.Fitnesses, Fitnesses))
+        self.Stopped = numpy.concatenate((self.Stopped, Stopped))
@@ -0,0 +1,102 @@
+import time
+
+
+class Profiler:
+    """
+    The Profiler class accumulates named timers and counters for the hot path of a simulation. Simulation.run only
+    creates one when c.PROFILE is set, so a disabled profiler costs a single None check per stage. The totals are
+    exchanged between processes as plain dictionaries, see to_dict and merge. The duration of every step marked with
+    start_step is kept as well, for latency percentiles, but stays in the process that ran the steps.
+    ...
+
+    Attributes
+    __________
+    Timers : dict
+        Total seconds spent in every named stage
+
+    Counters : dict
+        Total of every named counter
+
+    Mark : float
+        time.perf_counter value at the end of the last timed stage
+
+    StepDurations : float array
+        Seconds from the start of every step to the end of its last timed stage
+
+    StepStart : float
+        time.perf_counter value at the start of the current step, None outside a step
+
+    Methods
+    ________
+    start()
+        Starts timing the next stage
+
+    start_step()
+        Ends the previous step, see end_step, and starts timing the next step and its first stage
+
+    end_step()
+        Appends the time from the start of the current step to the end of its last timed stage to StepDurations
+
+    lap(Name)
+        Adds the time since the last start() or lap() to the timer Name and starts timing the next stage
+
+    add(Name, Seconds)
+        Adds Seconds to the timer Name
+
+    count(Name, Amount)
+        Adds Amount to the counter Name
+
+    merge(Profile)
+        Adds the timers and counters of a dictionary made by to_dict
+
+    to_dict()
+        Returns the timers and counters as a dictionary that can be pickled and sent to another process
+
+    reset()
+        Clears every timer, counter and step duration
+    """
+    def __init__(self):
+        self.Timers = {}
+        self.Counters = {}
+        self.Mark = time.perf_counter()
+        self.StepDurations = []
+        self.StepStart = None
+
+    def start(self):
+        self.Mark = time.perf_counter()
+
+    def start_step(self):
+        self.end_step()
+        self.start()
+        self.StepStart = self.Mark
+
+    def end_step(self):
+        if self.StepStart is not None:
+            self.StepDurations.append(self.Mark - self.StepStart)
+            self.StepStart = None
+
+    def lap(self, Name):
+        Now = time.perf_counter()
+        self.add(Name, Now - self.Mark)
+        self.Mark = Now
+
+    def add(self, Name, Seconds):
+        self.Timers[Name] = self.Timers.get(Name, 0.0) + Seconds
+
+    def count(self, Name, Amount=1):
+        self.Counters[Name] = self.Counters.get(Name, 0) + Amount
+
+    def merge(self, Profile):
+        for Name, Seconds in Profile["Timers"].items():
+            self.add(Name, Seconds)
+        for Name, Amount in Profile["Counters"].items():
+            self.Counters[Name] = self.Counters.get(Name, 0) + Amount
+
+    def to_dict(self):
+        return {"Timers": dict(self.Timers), "Counters": dict(self.Counters)}
+
+    def reset(self):
+        self.Timers = {}
+        self.Counters = {}
+        self.StepDurations = []
+        self.StepStart = None
@@ -0,0 +1,95 @@
+import numpy
+
+import pyrosim.pyrosim as pyrosim
+
+import pyrosim.constants as c
+
+from pyrosim.neuralNetwork import NEURAL_NETWORK
+
+class MATRIX_NEURAL_NETWORK:
+
+    def __init__(self,nndfFileName=None,network=None):
+
+        if network is None:
+
+            network = NEURAL_NETWORK(nndfFileName)
+
+        self.Compile( network )
+
+    def Print(self):
+
+        self.Print_Neuron_Values("sensor" , c.SENSOR_NEURON)
+
+        self.Print_Neuron_Values("hidden" , c.HIDDEN_NEURON)
+
+        self.Print_Neuron_Values("motor" , c.MOTOR_NEURON)
+
+        print("")
+
+    def Update(self, bodyID=None):
+
+        sensorValues = [pyrosim.Get_Touch_Sensor_Value_For_Link(linkName, bodyID) for linkName in self.sensorLinkNames]
+
+        self.values[self.sensorIndices] = sensorValues
+
+        self.values[self.updatedIndices] = numpy.tanh( self.values @ self.updatedWeights )
+
+    def Get_Neuron_Names(self):
+
+        return self.names
+
+    def Is_Motor_Neuron(self, neuronName):
+
+        return self.types[ self.indices[neuronName] ] == c.MOTOR_NEURON
+
+    def Get_Motor_Neurons_Joint(self, neuronName):
+
+        return self.jointNames[neuronName]
+
+    def Get_Value_Of(self, neuronName):
+
+        return self.values[ self.indices[neuronName] ]
+
+# ---------------- Private methods --------------------------------------
+
+    def Compile(self,network):
+
+        self.names = sorted(network.neurons)
+
+        self.indices = { name : index for index , name in enumerate(self.names) }
+
+        self.types = numpy.array( [ network.neurons[name].type for name in self.names ] )
+
+        self.values = numpy.zeros( len(self.names) )
+
+        self.sensorIndices = numpy.flatnonzero( self.types == c.SENSOR_NEURON )
+
+        self.sensorLinkNames = [ network.neurons[ self.names[index] ].Get_Link_Name() for index in self.sensorIndices ]
+
+        self.updatedIndices = numpy.flatnonzero( self.types != c.SENSOR_NEURON )
+
+        self.jointNames = {}
+
+        for name in self.names:
+
+            if network.neurons[name].Is_Motor_Neuron():
+
+                self.jointNames[name] = network.neurons[name].Get_Joint_Name()
+
+        weights = numpy.zeros( ( len(self.names) , len(self.names) ) )
+
+        for ( sourceNeuronName , targetNeuronName ) , synapse in network.synapses.items():
+
+            weights[ self.indices[sourceNeuronName] , self.indices[targetNeuronName] ] = synapse.Get_Weight()
+
+        self.updatedWeights = weights[ : , self.updatedIndices ]
+
+    def Print_Neuron_Values(self, label, neuronType):
+
+        print(label + " neuron values: " , end = "" )
+
+        for index in numpy.flatnonzero( self.types == neuronType ):
+
+            print(self.values[index] , " " , end="" )
+
+        print("")
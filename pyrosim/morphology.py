@@ -0,0 +1,49 @@
+import pybullet as p
+
+class MORPHOLOGY:
+
+    def __init__(self):
+
+        self.linkNamesToIndices = {}
+
+        self.jointNamesToIndices = {}
+
+        self.availableLinkIndex = -1
+
+        self.availableJointIndex = 0
+
+    def Add_Joint(self,name):
+
+        self.jointNamesToIndices[name] = self.availableJointIndex
+
+        self.availableJointIndex = self.availableJointIndex + 1
+
+    def Add_Link(self,name):
+
+        self.linkNamesToIndices[name] = self.availableLinkIndex
+
+        self.availableLinkIndex = self.availableLinkIndex + 1
+
+    def Read_From_Body(self,bodyID):
+
+        # Takes the tables from a body already loaded in pybullet, where each link has the index of the joint that attaches it
+
+        self.linkNamesToIndices = {}
+
+        self.jointNamesToIndices = {}
+
+        baseLinkName = p.getBodyInfo(bodyID)[0].decode()
+
+        self.linkNamesToIndices[baseLinkName] = -1
+
+        self.availableJointIndex = p.getNumJoints(bodyID)
+
+        for jointIndex in range(self.availableJointIndex):
+
+            jointInfo = p.getJointInfo(bodyID,jointIndex)
+
+            self.jointNamesToIndices[jointInfo[1].decode()] = jointIndex
+
+            self.linkNamesToIndices[jointInfo[12].decode()] = jointIndex
+
+        self.availableLinkIndex = self.availableJointIndex
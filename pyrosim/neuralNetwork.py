@@ -2,14 +2,20 @@ from pyrosim.neuron  import NEURON
 
 from pyrosim.synapse import SYNAPSE
 
+import pyrosim.constants as c
+
 class NEURAL_NETWORK: 
 
-    def __init__(self,nndfFileName):
+    def __init__(self,nndfFileName=None):
 
         self.neurons = {}
 
         self.synapses = {}
 
+        if nndfFileName is None:
+
+            return
+
         f = open(nndfFileName,"r")
 
         for line in f.readlines():
@@ -17,6 +23,18 @@ class NEURAL_NETWORK:
             self.Digest(line)
         f.close()
 
+    def Add_Motor_Neuron(self,name,jointName):
+
+        self.Add_Neuron( NEURON(name = name, type = c.MOTOR_NEURON, jointName = jointName) )
+
+    def Add_Sensor_Neuron(self,name,linkName):
+
+        self.Add_Neuron( NEURON(name = name, type = c.SENSOR_NEURON, linkName = linkName) )
+
+    def Add_Synapse(self,sourceNeuronName,targetNeuronName,weight):
+
+        self.Add_Synapse_Object( SYNAPSE(sourceNeuronName = sourceNeuronName, targetNeuronName = targetNeuronName, weight = weight) )
+
     def Print(self):
 
         self.Print_Sensor_Neuron_Values()
@@ -27,23 +45,27 @@ class NEURAL_NETWORK:
 
         print("")
 
-    def Update(self):
+    def Update(self, bodyID=None):
         for neuronName in sorted(self.neurons):
             if self.neurons[neuronName].Is_Sensor_Neuron():
-                self.neurons[neuronName].Update_Sensor_Neuron()
+                self.neurons[neuronName].Update_Sensor_Neuron(bodyID)
             else:
                 self.neurons[neuronName].Update_Hidden_Or_Motor_Neuron(self.neurons, self.synapses)
 # ---------------- Private methods --------------------------------------
 
-    def Add_Neuron_According_To(self,line):
-
-        neuron = NEURON(line)
+    def Add_Neuron(self,neuron):
 
         self.neurons[ neuron.Get_Name() ] = neuron
 
+    def Add_Neuron_According_To(self,line):
+
+        self.Add_Neuron( NEURON(line) )
+
     def Add_Synapse_According_To(self,line):
 
-        synapse = SYNAPSE(line)
+        self.Add_Synapse_Object( SYNAPSE(line) )
+
+    def Add_Synapse_Object(self,synapse):
 
         sourceNeuronName = synapse.Get_Source_Neuron_Name()
 
@@ -115,4 +137,4 @@ class NEURAL_NETWORK:
         return self.neurons[neuronName].Get_Joint_Name()
 
     def Get_Value_Of(self, neuronName):
-        return  self.neurons[neuronName].get_value()
+        return  self.neurons[neuronName].Get_Value()
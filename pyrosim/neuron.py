@@ -11,15 +11,27 @@ from pyrosim.synapse import SYNAPSE
 class NEURON:
 
 
-    def __init__(self,line):
+    def __init__(self,line=None,name=None,type=None,linkName=None,jointName=None):
 
-        self.Determine_Name(line)
+        if line is not None:
 
-        self.Determine_Type(line)
+            self.Determine_Name(line)
 
-        self.Search_For_Link_Name(line)
+            self.Determine_Type(line)
 
-        self.Search_For_Joint_Name(line)
+            self.Search_For_Link_Name(line)
+
+            self.Search_For_Joint_Name(line)
+
+        else:
+
+            self.name = str(name)
+
+            self.type = type
+
+            self.linkName = linkName
+
+            self.jointName = jointName
 
         self.Set_Value(0.0)
 
@@ -130,15 +142,15 @@ class NEURON:
         currSynapseWeight = float(currSynapseWeight)
         self.Add_To_Value(presynapticNeuronValue * currSynapseWeight)
 
-    def Update_Sensor_Neuron(self):
-        self.Set_Value(pyrosim.Get_Touch_Sensor_Value_For_Link(self.Get_Link_Name()))
+    def Update_Sensor_Neuron(self, bodyID=None):
+        self.Set_Value(pyrosim.Get_Touch_Sensor_Value_For_Link(self.Get_Link_Name(), bodyID))
 
     def Update_Hidden_Or_Motor_Neuron(self, neurons, synapses):
         x = 0
         self.Set_Value(x)
         for y in synapses:
             if self.Get_Name() == y[1]:
-                self.Allow_Presynaptic_Neuron_To_Influence_Me(synapses[y].Get_Weight(), neurons[y[0]].get_value())
+                self.Allow_Presynaptic_Neuron_To_Influence_Me(synapses[y].Get_Weight(), neurons[y[0]].Get_Value())
         self.Threshold()
 
 
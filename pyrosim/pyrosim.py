@@ -1,160 +1,133 @@
 import pybullet as p
 
-from pyrosim.nndf import NNDF
+from pyrosim.morphology import MORPHOLOGY
 
-from pyrosim.linksdf  import LINK_SDF
+# The functions that write files are thin wrappers around a single module-level writer from pyrosim.writer, so
+# only one document can be open through them at a time. Use the writer classes directly to write several documents
+# at once. pyrosim.writer is imported by the Start functions, so a simulation worker never loads the file writers.
 
-from pyrosim.linkurdf import LINK_URDF
-
-from pyrosim.model import MODEL
+# global linkNamesToIndices
 
-from pyrosim.sdf   import SDF
+# global jointNamesToIndices
 
-from pyrosim.urdf  import URDF
+writer = None
 
-from pyrosim.joint import JOINT
+morphology = None
 
-SDF_FILETYPE  = 0
+touchingLinks = None
 
-URDF_FILETYPE = 1
+touchingBodyLinks = None
 
-NNDF_FILETYPE   = 2
+def Clear_Contact_Snapshot():
 
-# global availableLinkIndex
+    global touchingLinks
 
-# global linkNamesToIndices
+    global touchingBodyLinks
 
-def End():
+    touchingLinks = None
 
-    if filetype == SDF_FILETYPE:
+    touchingBodyLinks = None
 
-        sdf.Save_End_Tag(f)
-
-    elif filetype == NNDF_FILETYPE:
-
-        nndf.Save_End_Tag(f)
-    else:
-        urdf.Save_End_Tag(f)
+def End():
 
-    f.close()
+    writer.End()
 
 def End_Model():
 
-    model.Save_End_Tag(f)
+    writer.End_Model()
 
-def Get_Touch_Sensor_Value_For_Link(linkName):
+def Get_Touch_Sensor_Value_For_Link(linkName,bodyID=None):
 
     touchValue = -1.0
 
     desiredLinkIndex = linkNamesToIndices[linkName]
 
-    pts = p.getContactPoints()
+    if touchingLinks is not None:
 
-    for pt in pts:
+        if bodyID is None:
 
-        linkIndex = pt[4]
+            touching = desiredLinkIndex in touchingLinks
 
-        if ( linkIndex == desiredLinkIndex ):
+        else:
 
-            touchValue = 1.0
+            touching = ( bodyID , desiredLinkIndex ) in touchingBodyLinks
 
-    return touchValue
-
-def Prepare_Link_Dictionary(urdfFileName):
+        if touching:
 
-    global linkNamesToIndices
-
-    linkNamesToIndices = {}
-
-    linkIndex = -1
-
-    f = open(urdfFileName,"r")
-
-    for line in f.readlines():
-
-        if "link name" in line:
-
-            line = line.split('"')
-
-            linkName = line[1]
-
-            linkNamesToIndices[linkName] = linkIndex
+            touchValue = 1.0
 
-            linkIndex = linkIndex + 1
+        return touchValue
 
-    f.close()
+    if bodyID is None:
 
-def Prepare_Joint_Dictionary(urdfFileName):
+        pts = p.getContactPoints()
 
-    global jointNamesToIndices
+    else:
 
-    jointNamesToIndices = {}
+        pts = p.getContactPoints(bodyA = bodyID)
 
-    jointIndex = 0
+    for pt in pts:
 
-    f = open(urdfFileName,"r")
+        if bodyID is None:
 
-    for line in f.readlines():
+            linkIndex = pt[4]
 
-        if "joint name" in line:
+        else:
 
-            line = line.split('"')
+            linkIndex = pt[3]
 
-            jointName = line[1]
+        if ( linkIndex == desiredLinkIndex ):
 
-            jointNamesToIndices[jointName] = jointIndex
+            touchValue = 1.0
 
-            jointIndex = jointIndex + 1
+    return touchValue
 
-    f.close()
+def Get_Morphology():
 
-def Prepare_To_Simulate(urdfFileName):
+    # The link and joint index tables of the last file started with Start_URDF or Start_SDF
 
-    Prepare_Link_Dictionary(urdfFileName)
+    return morphology
 
-    Prepare_Joint_Dictionary(urdfFileName)
+def Prepare_To_Simulate(bodyOrMorphology):
 
-def Send_Cube(name="default",pos=[0,0,0],size=[1,1,1]):
+    # Accepts a MORPHOLOGY, or the id of a loaded body whose tables are then read back from pybullet
 
-    global availableLinkIndex
+    global linkNamesToIndices
 
-    if filetype == SDF_FILETYPE:
+    global jointNamesToIndices
 
-        Start_Model(name,pos)
+    if isinstance(bodyOrMorphology,MORPHOLOGY):
 
-        link = LINK_SDF(name,pos,size)
+        bodyMorphology = bodyOrMorphology
     else:
-        link = LINK_URDF(name,pos,size)
+        bodyMorphology = MORPHOLOGY()
 
-    link.Save(f)
+        bodyMorphology.Read_From_Body(bodyOrMorphology)
 
-    if filetype == SDF_FILETYPE:
+    linkNamesToIndices = bodyMorphology.linkNamesToIndices
 
-        End_Model()
+    jointNamesToIndices = bodyMorphology.jointNamesToIndices
 
-    linkNamesToIndices[name] = availableLinkIndex
+def Send_Cube(name="default",pos=[0,0,0],size=[1,1,1]):
 
-    availableLinkIndex = availableLinkIndex + 1
+    writer.Send_Cube(name,pos,size)
 
 def Send_Joint(name,parent,child,type,position, jointAxis):
 
-    joint = JOINT(name,parent,child,type,position)
-
-    joint.Save(f, jointAxis)
+    writer.Send_Joint(name,parent,child,type,position,jointAxis)
 
 def Send_Motor_Neuron(name,jointName):
 
-    f.write('    <neuron name = "' + str(name) + '" type = "motor"  jointName = "' + jointName + '" />\n')
+    writer.Send_Motor_Neuron(name,jointName)
 
 def Send_Sensor_Neuron(name,linkName):
 
-    f.write('    <neuron name = "' + str(name) + '" type = "sensor" linkName = "' + linkName + '" />\n')
+    writer.Send_Sensor_Neuron(name,linkName)
 
 def Send_Synapse( sourceNeuronName , targetNeuronName , weight ):
 
-    f.write('    <synapse sourceNeuronName = "' + str(sourceNeuronName) + '" targetNeuronName = "' + str(targetNeuronName) + '" weight = "' + str(weight) + '" />\n')
+    writer.Send_Synapse(sourceNeuronName,targetNeuronName,weight)
 
- 
 def Set_Motor_For_Joint(bodyIndex,jointName,controlMode,targetPosition,maxForce):
 
     p.setJointMotorControl2(
@@ -169,74 +142,88 @@ def Set_Motor_For_Joint(bodyIndex,jointName,controlMode,targetPosition,maxForce)
 
         force          = maxForce)
 
-def Start_NeuralNetwork(filename):
+def Set_Motors_For_Joints(bodyIndex,jointNames,controlMode,targetPositions,maxForce):
 
-    global filetype
+    # Commands every joint in jointNames with one pybullet call, targetPositions[i] going to jointNames[i]
 
-    filetype = NNDF_FILETYPE
+    p.setJointMotorControlArray(
 
-    global f
+        bodyIndex      = bodyIndex,
 
-    f = open(filename,"w")
+        jointIndices   = [ jointNamesToIndices[jointName] for jointName in jointNames ],
 
-    global nndf
+        controlMode    = controlMode,
 
-    nndf = NNDF()
+        targetPositions = targetPositions,
 
-    nndf.Save_Start_Tag(f)
+        forces         = [ maxForce ] * len(jointNames))
 
-def Start_SDF(filename):
+def Take_Contact_Snapshot():
 
-    global availableLinkIndex
+    # Fetches the contact points once so every touch sensor lookup until the next snapshot is served from memory
 
-    availableLinkIndex = -1
+    global touchingLinks
 
-    global linkNamesToIndices
+    global touchingBodyLinks
+
+    touchingLinks = set()
 
-    linkNamesToIndices = {}
+    touchingBodyLinks = set()
 
-    global filetype
+    for pt in p.getContactPoints():
 
-    filetype = SDF_FILETYPE
+        touchingLinks.add( pt[4] )
 
-    global f
- 
-    f = open(filename,"w")
+        touchingBodyLinks.add( ( pt[1] , pt[3] ) )
 
-    global sdf
+        touchingBodyLinks.add( ( pt[2] , pt[4] ) )
 
-    sdf = SDF()
+def Start_NeuralNetwork(filename):
 
-    sdf.Save_Start_Tag(f)
+    from pyrosim.writer import NNDF_WRITER
+
+    Start_Writer( NNDF_WRITER(filename) )
+
+def Start_SDF(filename):
+
+    from pyrosim.writer import SDF_WRITER
+
+    Start_Writer( SDF_WRITER(filename) )
+
+    Use_Morphology_Of_Writer()
 
 def Start_URDF(filename):
 
-    global availableLinkIndex
+    from pyrosim.writer import URDF_WRITER
 
-    availableLinkIndex = -1
+    Start_Writer( URDF_WRITER(filename) )
 
-    global linkNamesToIndices
+    Use_Morphology_Of_Writer()
 
-    linkNamesToIndices = {}
+def Start_Model(modelName,pos):
 
-    global filetype
+    writer.Start_Model(modelName,pos)
 
-    filetype = URDF_FILETYPE
+# ---------------- Private methods --------------------------------------
 
-    global f
+def Start_Writer(newWriter):
 
-    f = open(filename,"w")
+    global writer
 
-    global urdf 
+    writer = newWriter
 
-    urdf = URDF()
+    writer.Start()
 
-    urdf.Save_Start_Tag(f)
+def Use_Morphology_Of_Writer():
 
-def Start_Model(modelName,pos):
+    global morphology
+
+    morphology = writer.morphology
 
-    global model 
+    global linkNamesToIndices
+
+    linkNamesToIndices = morphology.linkNamesToIndices
 
-    model = MODEL(modelName,pos)
+    global jointNamesToIndices
 
-    model.Save_Start_Tag(f)
+    jointNamesToIndices = morphology.jointNamesToIndices
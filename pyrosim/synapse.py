@@ -6,13 +6,23 @@ import pyrosim.constants as c
 
 class SYNAPSE: 
 
-    def __init__(self,line):
+    def __init__(self,line=None,sourceNeuronName=None,targetNeuronName=None,weight=None):
 
-        self.Determine_Source_Neuron_Name(line)
+        if line is not None:
 
-        self.Determine_Target_Neuron_Name(line)
+            self.Determine_Source_Neuron_Name(line)
 
-        self.Determine_Weight(line)
+            self.Determine_Target_Neuron_Name(line)
+
+            self.Determine_Weight(line)
+
+        else:
+
+            self.sourceNeuronName = str(sourceNeuronName)
+
+            self.targetNeuronName = str(targetNeuronName)
+
+            self.weight = float(weight)
 
     def Get_Source_Neuron_Name(self):
 
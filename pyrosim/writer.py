@@ -0,0 +1,140 @@
+import io
+
+from pyrosim.nndf import NNDF
+
+from pyrosim.linksdf  import LINK_SDF
+
+from pyrosim.linkurdf import LINK_URDF
+
+from pyrosim.model import MODEL
+
+from pyrosim.sdf   import SDF
+
+from pyrosim.urdf  import URDF
+
+from pyrosim.joint import JOINT
+
+from pyrosim.morphology import MORPHOLOGY
+
+# Each writer keeps the state of one open document, so several documents can be written at once, e.g. from threads.
+# Use them as context managers: the document is started on entering and ended on leaving the with block.
+# Documents are rendered into an in-memory buffer and written to filename with a single write when they end, or,
+# when filename is None, only kept as bytes in contents, e.g. to be written to a tmpfs path by the caller.
+
+class WRITER:
+
+    def __init__(self,filename=None):
+
+        self.filename = filename
+
+        self.f = None
+
+        self.contents = None
+
+        self.morphology = MORPHOLOGY()
+
+    def __enter__(self):
+
+        self.Start()
+
+        return self
+
+    def __exit__(self,exceptionType,exception,traceback):
+
+        if exceptionType is None:
+
+            self.End()
+        else:
+            self.f.close()
+
+    def End(self):
+
+        self.document.Save_End_Tag(self.f)
+
+        self.contents = self.f.getvalue().encode()
+
+        self.f.close()
+
+        if self.filename is not None:
+
+            with open(self.filename,"wb") as f:
+
+                f.write(self.contents)
+
+        return self.contents
+
+    def Start(self):
+
+        self.f = io.StringIO()
+
+        self.document = self.Create_Document()
+
+        self.document.Save_Start_Tag(self.f)
+
+class NNDF_WRITER(WRITER):
+
+    def Create_Document(self):
+
+        return NNDF()
+
+    def Send_Motor_Neuron(self,name,jointName):
+
+        self.f.write('    <neuron name = "' + str(name) + '" type = "motor"  jointName = "' + jointName + '" />\n')
+
+    def Send_Sensor_Neuron(self,name,linkName):
+
+        self.f.write('    <neuron name = "' + str(name) + '" type = "sensor" linkName = "' + linkName + '" />\n')
+
+    def Send_Synapse(self,sourceNeuronName,targetNeuronName,weight):
+
+        self.f.write('    <synapse sourceNeuronName = "' + str(sourceNeuronName) + '" targetNeuronName = "' + str(targetNeuronName) + '" weight = "' + str(weight) + '" />\n')
+
+class SDF_WRITER(WRITER):
+
+    def Create_Document(self):
+
+        return SDF()
+
+    def End_Model(self):
+
+        self.model.Save_End_Tag(self.f)
+
+    def Send_Cube(self,name="default",pos=[0,0,0],size=[1,1,1]):
+
+        self.Start_Model(name,pos)
+
+        link = LINK_SDF(name,pos,size)
+
+        link.Save(self.f)
+
+        self.End_Model()
+
+        self.morphology.Add_Link(name)
+
+    def Start_Model(self,modelName,pos):
+
+        self.model = MODEL(modelName,pos)
+
+        self.model.Save_Start_Tag(self.f)
+
+class URDF_WRITER(WRITER):
+
+    def Create_Document(self):
+
+        return URDF()
+
+    def Send_Cube(self,name="default",pos=[0,0,0],size=[1,1,1]):
+
+        link = LINK_URDF(name,pos,size)
+
+        link.Save(self.f)
+
+        self.morphology.Add_Link(name)
+
+    def Send_Joint(self,name,parent,child,type,position,jointAxis):
+
+        joint = JOINT(name,parent,child,type,position)
+
+        joint.Save(self.f, jointAxis)
+
+        self.morphology.Add_Joint(name)
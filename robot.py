@@ -1,10 +1,17 @@
 from sensor import Sensor
-from motor import Motor
 import pybullet as p
+import logging
 import pyrosim.pyrosim as pyrosim
 from pyrosim.neuralNetwork import NEURAL_NETWORK
+from pyrosim.matrixNeuralNetwork import MATRIX_NEURAL_NETWORK
 import constants as c
 import os
+from tracesink import get_trace_sink
+from telemetry import get_telemetry
+from brain import build_neural_network
+from assets import get_body_file, get_body_morphology
+
+logger = logging.getLogger(__name__)
 
 class Robot:
     """
@@ -18,20 +25,46 @@ class Robot:
     solutionID : int
         Assigned from AFPO class
 
+    Offset : list
+        Position at which the body is loaded, so several Robots can share one simulation without interacting
+
+    Weights : numpy array
+        When given, the neural network is built directly from these weights instead of reading the brain NNDF file
+
     Attributes
     __________
     Sensors : arr
         Holds all Sensor links
 
-    Motors : arr
-        Holds all Motor links
-
     Robot : pybullet body plan
         Establishes body plan prior to simulation
 
-    NN : NEURAL_NETWORK
-        Creates the neural network for the Robot body by creating a file that establishes the weighted values
-        between Sensors and Motors
+    SolutionID : int
+        Assigned from AFPO class, written into every trace record
+
+    Stopped : bool
+        True when an early-stopping policy ended this Robot's simulation, its fitness is then truncated
+
+    Policies : EarlyStoppingPolicy array
+        Early-stopping policies checked for this Robot, set by Simulation.run
+
+    Trace : TraceSink
+        Receives a sampled binary trace of the motor commands, None unless c.TRACE_DIRECTORY is set
+
+    Telemetry : Telemetry
+        Records every sensor value and motor command of the current Solution, with the Sensors' links followed by
+        MotorJointNames as channels. None unless c.TELEMETRY_DIRECTORY is set
+
+    NN : NEURAL_NETWORK or MATRIX_NEURAL_NETWORK
+        The neural network for the Robot body that establishes the weighted values between Sensors and motors,
+        built from Weights or from the brain NNDF file. c.NEURAL_NETWORK_ENGINE selects the vectorized "matrix" engine or the
+        original "dict" engine
+
+    MotorNeuronNames : arr
+        Names of the motor neurons of NN
+
+    MotorJointNames : arr
+        Joint driven by each motor neuron in MotorNeuronNames
 
 
     Methods
@@ -40,65 +73,104 @@ class Robot:
         Establishes values for each sensor by call Sensor class
 
     sense(t):
-        Returns the values of each Sensor according to the index value, t
+        Reads the value of each Sensor at step t into the Telemetry
 
-    prepare_to_act():
-        Establishes connections between each joint
+    prepare_to_think(solutionID, Weights):
+        Builds the neural network from Weights, or from the brain NNDF file when Weights is None, and starts a new
+        Telemetry recording. Called again to swap in a new brain when the loaded body is reused for another Solution
+
+    reset_motors():
+        Puts every joint back on the zero velocity motor a freshly loaded body starts with, whose maximum impulse is
+        1 per time step, since restoring a saved state does not undo the motor targets set by the previous Solution
 
     act(t):
-        Set the value for each motor joint with a desired angle for the Robot. Each value is also printed
+        Sets the joint of each motor neuron to the desired angle given by that neuron, for all joints in one pybullet
+        call. Each value is logged at DEBUG level and every c.TRACE_SAMPLE_INTERVAL steps the values are written to
+        the trace sink
 
     think():
-        The neural network is updated and printed
+        The neural network is updated
+
+    stop():
+        Marks the Robot as stopped early and freezes its fitness at the current value
 
-    get_fitness(solutionID):
-        Creates a fitness.txt file on disk for a certain Robot. Note the Fitness value is negative since it is currently
-        decided by the distance the Robot travels "away" from the camera, which is a negative coordinate value.
+    compute_fitness():
+        Returns the fitness value of the Robot, or the truncated fitness when it was stopped early. Note the Fitness value is negative since it is currently decided by
+        the distance the Robot travels "away" from the camera, which is a negative coordinate value.
     """
-    def __init__(self, solutionID):
+    def __init__(self, solutionID, Offset=[0, 0, 0], Weights=None):
         self.Sensors = {}
-        self.Motors = {}
-        self.Robot = p.loadURDF("body.urdf")
-        pyrosim.Prepare_To_Simulate("body.urdf")
+        self.Telemetry = None
+        self.Offset = Offset
+        self.Stopped = False
+        self.Policies = []
+        self.Trace = get_trace_sink()
+        self.Robot = p.loadURDF(get_body_file(), basePosition=Offset)
+        pyrosim.Prepare_To_Simulate(get_body_morphology())
         self.prepare_to_sense()
-        self.prepare_to_act()
-        self.NN = NEURAL_NETWORK("brain" + str(solutionID) + ".nndf")
+        self.prepare_to_think(solutionID, Weights)
+
+    def prepare_to_think(self, solutionID, Weights=None):
+        self.SolutionID = int(solutionID)
+        if Weights is not None:
+            network = build_neural_network(Weights)
+        else:
+            network = NEURAL_NETWORK("brain" + str(solutionID) + ".nndf")
+            os.remove("brain" + str(solutionID) + ".nndf")
+
+        if c.NEURAL_NETWORK_ENGINE == "matrix":
+            self.NN = MATRIX_NEURAL_NETWORK(network=network)
+        else:
+            self.NN = network
+
+        self.MotorNeuronNames = [NeuronName for NeuronName in self.NN.Get_Neuron_Names()
+                                 if self.NN.Is_Motor_Neuron(NeuronName)]
+        self.MotorJointNames = [self.NN.Get_Motor_Neurons_Joint(NeuronName) for NeuronName in self.MotorNeuronNames]
 
-        os.system("rm brain" + str(solutionID) + ".nndf")
+        if self.Telemetry is not None:
+            self.Telemetry.close()
+        self.Telemetry = get_telemetry(self.SolutionID, list(self.Sensors) + self.MotorJointNames)
 
     def prepare_to_sense(self):
         self.Sensors = {}
         for LinkName in pyrosim.linkNamesToIndices:
-            self.Sensors[LinkName] = Sensor(LinkName)
+            self.Sensors[LinkName] = Sensor(LinkName, self.Robot)
 
     def sense(self, t):
-       for i in self.Sensors:
-            self.Sensors[i].get_value(t)
+        self.Telemetry.record(t, 1, [self.Sensors[LinkName].get_value(t) for LinkName in self.Sensors])
 
-    def prepare_to_act(self):
-        for JointName in pyrosim.jointNamesToIndices:
-            self.Motors[JointName] = Motor(JointName)
+    def reset_motors(self):
+        JointIndices = list(range(p.getNumJoints(self.Robot)))
+        DefaultForce = 1 / p.getPhysicsEngineParameters()["fixedTimeStep"]
+        p.setJointMotorControlArray(self.Robot, JointIndices, p.VELOCITY_CONTROL,
+                                    targetVelocities=[0] * len(JointIndices), forces=[DefaultForce] * len(JointIndices))
 
     def act(self, t):
-        for NeuronName in self.NN.Get_Neuron_Names():
-            if self.NN.Is_Motor_Neuron(NeuronName):
-                JointName = self.NN.Get_Motor_Neurons_Joint(NeuronName)
-                DesiredAngle = self.NN.Get_Value_Of(NeuronName) * c.MOTOR_JOINT_RANGE
-                for i in self.Motors:
-                    self.Motors[i].set_value(self.Robot, DesiredAngle)
-                print(NeuronName, JointName, DesiredAngle)
+        DesiredAngles = [self.NN.Get_Value_Of(NeuronName) * c.MOTOR_JOINT_RANGE
+                         for NeuronName in self.MotorNeuronNames]
+        pyrosim.Set_Motors_For_Joints(self.Robot, self.MotorJointNames, p.POSITION_CONTROL, DesiredAngles,
+                                      c.FORCE_AMOUNT)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            for NeuronName, JointName, DesiredAngle in zip(self.MotorNeuronNames, self.MotorJointNames, DesiredAngles):
+                logger.debug("%s %s %s", NeuronName, JointName, DesiredAngle)
+
+        if self.Telemetry is not None:
+            self.Telemetry.record(t, 1 + len(self.Sensors), DesiredAngles)
+
+        if self.Trace is not None and t % c.TRACE_SAMPLE_INTERVAL == 0:
+            self.Trace.write(self.SolutionID, t, DesiredAngles)
 
     def think(self):
-        self.NN.Update()
-        self.NN.Print()
+        self.NN.Update(self.Robot)
 
-    def get_fitness(self, solutionID):
+    def stop(self):
+        self.StoppedFitness = self.compute_fitness()
+        self.Stopped = True
+
+    def compute_fitness(self):
+        if self.Stopped:
+            return self.StoppedFitness
         stateOfLinkZero = p.getLinkState(self.Robot, 0)
         positionOfLinkZero = stateOfLinkZero[0]
-        xCoordinateOfLinkZero = str(positionOfLinkZero[0])
-        f = open("tmp" + str(solutionID) + ".txt", "w")
-        f.write(xCoordinateOfLinkZero)
-        f.close()
-
-        os.rename("tmp" + str(solutionID) + ".txt", "fitness" + str(solutionID) + ".txt")
-        exit()
\ No newline at end of file
+        return positionOfLinkZero[0] - self.Offset[0]
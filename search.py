@@ -1,7 +1,25 @@
-import os
-
 from AFPO import AFPO
+import constants as c
+import argparse
+import logging
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evolve robots with Age-Fitness Pareto Optimization.")
+    parser.add_argument("--checkpoint", default=c.CHECKPOINT_FILE,
+                        help="file the run is saved to every CHECKPOINT_INTERVAL generations")
+    parser.add_argument("--resume", action="store_true", help="continue the run saved in the checkpoint file")
+    parser.add_argument("--asynchronous", action="store_true",
+                        help="evolve in steady state, inserting each individual as soon as its fitness arrives")
+    args = parser.parse_args()
 
-afpo = AFPO()
-afpo.evolve()
-afpo.show_best()
\ No newline at end of file
+    logging.basicConfig(level=c.LOG_LEVEL)
+    c.CHECKPOINT_FILE = args.checkpoint
+    afpo = AFPO()
+    if args.resume:
+        afpo.resume(args.checkpoint)
+    if args.asynchronous:
+        afpo.evolve_asynchronously()
+    else:
+        afpo.evolve()
+    afpo.close()
+    afpo.show_best()
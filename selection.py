@@ -0,0 +1,45 @@
+import bisect
+import numpy
+
+
+def pareto_fronts(Ages, Fitnesses):
+    """
+    Returns the non-dominated front of every individual, 0 being the Pareto front, for the age-fitness objectives
+    where both lower age and lower fitness are better. An individual is dominated when another one is no older and
+    no less fit, and strictly better in at least one of the two.
+
+    The individuals are swept in order of increasing age, then fitness, while the lowest fitness reached by every
+    front so far is kept in a sorted list. An individual belongs to the first front whose lowest fitness is still
+    above its own, found by binary search, so the whole sort takes O(n log n).
+    """
+    Ages = numpy.asarray(Ages)
+    Fitnesses = numpy.asarray(Fitnesses)
+    Order = numpy.lexsort((Fitnesses, Ages))
+    Fronts = numpy.zeros(len(Order), dtype=int)
+    FrontMinimumFitnesses = []
+
+    Previous = None
+    for Index in Order:
+        if Previous is not None and Ages[Index] == Ages[Previous] and Fitnesses[Index] == Fitnesses[Previous]:
+            Fronts[Index] = Fronts[Previous]
+            continue
+
+        Front = bisect.bisect_right(FrontMinimumFitnesses, Fitnesses[Index])
+        if Front == len(FrontMinimumFitnesses):
+            FrontMinimumFitnesses.append(Fitnesses[Index])
+        else:
+            FrontMinimumFitnesses[Front] = Fitnesses[Index]
+        Fronts[Index] = Front
+        Previous = Index
+
+    return Fronts
+
+
+def select_survivors(Ages, Fitnesses, Count):
+    """
+    Returns the sorted indices of the Count individuals kept by age-fitness Pareto selection. Whole fronts are kept
+    in order, starting with the Pareto front, and the last front that only partly fits is cut by fitness, then age.
+    """
+    Fronts = pareto_fronts(Ages, Fitnesses)
+    Ranking = numpy.lexsort((numpy.asarray(Ages), numpy.asarray(Fitnesses), Fronts))
+    return numpy.sort(Ranking[:Count])
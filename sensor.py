@@ -1,11 +1,8 @@
-import numpy
-import constants as c
 import pyrosim.pyrosim as pyrosim
-import pathlib
 
 class Sensor:
     """
-    The Sensor class retrieves and saves the sensor values for each link in the Robot.
+    The Sensor class retrieves the touch sensor value of one link in the Robot.
 
     ...
     Parameters
@@ -13,30 +10,30 @@ class Sensor:
     LinkName : str
         Assigned from Robot class
 
+    BodyID : int
+        The pybullet body the link belongs to, assigned from Robot class
+
     Attributes
     __________
     LinkName : str
         Assigned from Robot class
 
-    Values : np array
-        an array which holds the sensor value after the simulation occurs.
+    Value : float
+        The touch value read at the last step, 1.0 when the link touches something and -1.0 otherwise
 
 
     Methods
     ________
     get_value(x)
-        Returns the array from self.values
-
-    save_value ()
-        Saves the values to a file on disk
+        Reads and returns the touch value of the link at step x. Robot records it in its Telemetry, so no per-link
+        array is allocated
     """
-    def __init__(self, LinkName):
+    def __init__(self, LinkName, BodyID=None):
         self.LinkName = LinkName
-        self.Values = numpy.zeros(c.NUM_STEPS)
+        self.BodyID = BodyID
+        self.Value = None
 
 
     def get_value(self, x):
-        self.Values[x] = pyrosim.Get_Touch_Sensor_Value_For_Link(self.LinkName)
-
-    def save_value (self):
-        numpy.save(r'C:\Users\Administrator\Documents\LUDObots\data\sensorValues.npy', self.Values)
\ No newline at end of file
+        self.Value = pyrosim.Get_Touch_Sensor_Value_For_Link(self.LinkName, self.BodyID)
+        return self.Value
@@ -1,8 +1,34 @@
-from simulation import Simulation
+import constants as c
+import logging
 import sys
 
-direcotOrGUI = sys.argv[1]
-solutionID = sys.argv[2]
-simulation = Simulation(direcotOrGUI, solutionID)
-simulation.run()
-simulation.get_fitness(solutionID)
+
+def run_simulation(DirectOrGUI, SolutionID, WeightsBuffer, Connection):
+    """
+    Simulates a single Solution, whose brain is built from the serialized WeightsBuffer, and sends its fitness back
+    to the caller through Connection, the sending end of a multiprocessing Pipe, so no file ever touches the disk.
+    The Profiler totals of the simulation are sent along with the fitness, None unless c.PROFILE is set.
+
+    The simulation modules are imported here rather than at the top of the module, so importing simulate, e.g. to
+    start this function in a new process, stays cheap and the process only loads the runtime it needs.
+    """
+    from simulation import Simulation
+    from brain import weights_from_bytes
+
+    logging.basicConfig(level=c.LOG_LEVEL)
+    simulation = Simulation(DirectOrGUI, SolutionID, Weights=weights_from_bytes(WeightsBuffer))
+    simulation.run()
+    Profile = simulation.Profiler.to_dict() if simulation.Profiler is not None else None
+    Connection.send((simulation.compute_fitness(), Profile))
+    Connection.close()
+
+
+if __name__ == "__main__":
+    from simulation import Simulation
+
+    logging.basicConfig(level=c.LOG_LEVEL)
+    direcotOrGUI = sys.argv[1]
+    solutionID = sys.argv[2]
+    simulation = Simulation(direcotOrGUI, solutionID)
+    simulation.run()
+    print(simulation.compute_fitness())
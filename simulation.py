@@ -1,15 +1,13 @@
 from world import World
 from robot import Robot
+from earlystopping import create_policies
+from profiler import Profiler
 
 import time
 import pybullet as p
 import pyrosim.pyrosim as pyrosim
 import pybullet_data
-import numpy
 import constants as c
-import math
-import random
-import pathlib
 
 
 
@@ -26,6 +24,13 @@ class Simulation:
     SolutionID : str
         Assigned from AFPO class
 
+    Connect : bool
+        When False the Simulation reuses the physics client already connected by the caller, e.g. a worker
+        process from the Evaluator
+
+    Weights : numpy array
+        Weights the Robot's brain is built from in memory. When None the brain is read from the brain NNDF file
+
     Attributes
     __________
     DirectOrGUI : str
@@ -37,47 +42,151 @@ class Simulation:
     Robot : Robot
         Establishes Robot conditions for simulation
 
+    Robots : Robot array
+        Every Robot stepped by run(), a single entry unless this is a BatchSimulation
+
+    StateID : int
+        pybullet snapshot of the freshly loaded World and Robots, restored by reset()
+
+    Profiler : Profiler
+        Timers and counters of the last run(), None unless c.PROFILE is set
+
     Methods
     ________
-    run()
-        Passes in all components of simulation, including the Robot and World components
+    run(Policies, Target)
+        Passes in all components of simulation, including the Robot and World components. Each Robot is stopped
+        early as soon as one of the named early-stopping Policies gives up on it, Target being the best fitness on
+        the current Pareto front. Robot.sense is skipped unless the Robot records Telemetry. When c.PROFILE is set the
+        time spent in every stage of a step is accumulated in Profiler, along with the duration of every step
 
-    get_fitness(solutionID)
+    compute_fitness()
         Returns fitness value of a Robot after simulation
+
+    compute_fitnesses()
+        Returns the fitness value of every Robot in the simulation
+
+    reset(SolutionIDs, WeightsList)
+        Restores the snapshot taken after loading and swaps a new brain into each Robot, so the loaded World and
+        bodies are reused for the next Solutions without parsing or building them again
     """
-    def __init__(self, DirectOrGUI, SolutionID):
-        if DirectOrGUI == "DIRECT":
+    def __init__(self, DirectOrGUI, SolutionID, Connect=True, Weights=None):
+        self.connect(DirectOrGUI, Connect)
+        self.World = World()
+        self.Robot = Robot(SolutionID, Weights=Weights)
+        self.Robots = [self.Robot]
+        self.StateID = p.saveState()
+        self.Profiler = None
+
+    def connect(self, DirectOrGUI, Connect):
+        self.Connected = Connect
+        if Connect and DirectOrGUI == "DIRECT":
             self.physicsClient = p.connect(p.DIRECT)
-        elif DirectOrGUI == "GUI":
+        elif Connect and DirectOrGUI == "GUI":
             self.physicsClient = p.connect(p.GUI)
 
         self.DirectOrGUI = DirectOrGUI
         p.setAdditionalSearchPath(pybullet_data.getDataPath())
         p.setGravity(0,0,-9.8)
-        self.World = World()
-        self.Robot = Robot(SolutionID)
+        p.setPhysicsEngineParameter(deterministicOverlappingPairs=1)
 
-    def run(self):
-        BackLegSensorValues = numpy.zeros(c.NUM_STEPS)
-        FrontLegSensorValues = numpy.zeros(c.NUM_STEPS)
-        FrontLegTargetAngles = c.FRONT_LEG_AMPLITUDE * numpy.sin(c.FRONT_LEG_FREQUENCY * numpy.linspace(-numpy.pi, numpy.pi,
-                                                                                                        c.NUM_STEPS) +
-                                                                 c.FRONT_LEG_PHASE_OFFSET)
-
-        BackLegTargetAngles = c.BACK_LEG_AMPLITUDE * numpy.sin(c.BACK_LEG_FREQUENCY * numpy.linspace(-numpy.pi, numpy.pi,
-                                                                                                     c.NUM_STEPS) +
-                                                               c.BACK_LEG_PHASE_OFFSET)
+    def run(self, Policies=(), Target=None):
+        for robot in self.Robots:
+            robot.Policies = create_policies(Policies, Target)
+            robot.Stopped = False
+        RunningRobots = self.Robots
+        profiler = Profiler() if c.PROFILE else None
+        self.Profiler = profiler
 
         for x in range (0, c.NUM_STEPS):
+            if profiler is not None:
+                profiler.start_step()
+                profiler.count("steps")
+                profiler.count("robot_steps", len(RunningRobots))
             p.stepSimulation()
-            self.Robot.sense(x)
-            self.Robot.think()
-            self.Robot.act(x)
+            if profiler is not None:
+                profiler.lap("step_simulation")
+            pyrosim.Take_Contact_Snapshot()
+            if profiler is not None:
+                profiler.lap("contact_snapshot")
+            for robot in RunningRobots:
+                if robot.Telemetry is not None:
+                    robot.sense(x)
+                    if profiler is not None:
+                        profiler.lap("sense")
+                robot.think()
+                if profiler is not None:
+                    profiler.lap("think")
+                robot.act(x)
+                if profiler is not None:
+                    profiler.lap("act")
+            if Policies and x % c.EARLY_STOPPING_INTERVAL == 0:
+                for robot in RunningRobots:
+                    if any(policy.should_stop(robot, x) for policy in robot.Policies):
+                        robot.stop()
+                RunningRobots = [robot for robot in RunningRobots if not robot.Stopped]
+                if profiler is not None:
+                    profiler.lap("early_stopping")
+                if not RunningRobots:
+                    break
             if self.DirectOrGUI == "GUI":
                 time.sleep(c.SLEEP_AMOUNT)
-
-    def get_fitness(self, solutionID):
-        self.Robot.get_fitness(solutionID)
+        pyrosim.Clear_Contact_Snapshot()
+        for robot in self.Robots:
+            if robot.Trace is not None:
+                robot.Trace.flush()
+            if robot.Telemetry is not None:
+                robot.Telemetry.flush()
+        if profiler is not None:
+            profiler.end_step()
+            profiler.count("simulations")
+            profiler.count("stopped_robots", sum(robot.Stopped for robot in self.Robots))
+
+    def reset(self, SolutionIDs, WeightsList):
+        p.restoreState(self.StateID)
+        for robot, SolutionID, Weights in zip(self.Robots, SolutionIDs, WeightsList):
+            robot.reset_motors()
+            robot.prepare_to_think(SolutionID, Weights)
+
+    def compute_fitness(self):
+        return self.Robot.compute_fitness()
+
+    def compute_fitnesses(self):
+        return [robot.compute_fitness() for robot in self.Robots]
 
     def __del__(self):
-        p.disconnect()
+        if self.Connected:
+            p.disconnect()
+
+
+class BatchSimulation(Simulation):
+    """
+    The BatchSimulation class loads one Robot per Solution into a single physics client and steps them all with one
+    p.stepSimulation call. Each Robot, along with its own copy of the world, is placed c.BATCH_SPACING apart along
+    the y axis so the Robots never interact, and each Robot's fitness is read from its own body.
+    ...
+
+    Parameters
+    ___________
+    DirectOrGUI : str
+        Used to guide the simulator. Direct implies no visual, GUI implies the Robots' motion will be shown on screen.
+
+    SolutionIDs : str array
+        Assigned from AFPO class, one per Robot
+
+    Connect : bool
+        When False the BatchSimulation reuses the physics client already connected by the caller
+
+    WeightsList : numpy array list
+        Weights each Robot's brain is built from in memory, one per Solution
+    """
+    def __init__(self, DirectOrGUI, SolutionIDs, Connect=True, WeightsList=None):
+        self.connect(DirectOrGUI, Connect)
+        if WeightsList is None:
+            WeightsList = [None] * len(SolutionIDs)
+        Offsets = [[0, x * c.BATCH_SPACING, 0] for x in range(len(SolutionIDs))]
+        self.World = World(Offsets)
+        self.Robots = [Robot(SolutionID, Offset, Weights)
+                       for SolutionID, Offset, Weights in zip(SolutionIDs, Offsets, WeightsList)]
+        self.Robot = self.Robots[0]
+        self.StateID = p.saveState()
+        self.Profiler = None
@@ -0,0 +1,78 @@
+import os
+import numpy
+import constants as c
+
+
+class Telemetry:
+    """
+    The Telemetry class records the sensor values and motor commands of one simulated Robot into a single array of
+    shape (rows, channels) that is allocated once, before the simulation starts. Column 0 holds the step number and
+    the remaining columns hold one channel each. When there are fewer rows than steps the array is a ring buffer
+    holding the most recent steps. Step t goes to row t % rows. Rows not yet written hold NaN.
+    ...
+
+    Parameters
+    __________
+    Channels : str array
+        Name of every recorded channel, in column order after the step column
+
+    FileName : str
+        .npy file the array is memory-mapped to, None keeps it in memory only
+
+    Rows : int
+        Number of steps kept, defaults to c.TELEMETRY_STEPS or, when that is None, to c.NUM_STEPS
+
+    Attributes
+    __________
+    Values : numpy array or numpy memmap
+        The recorded steps, one row per step
+
+    Methods
+    ________
+    record(Step, Column, Values)
+        Writes Values into the row of Step, starting at Column
+
+    flush()
+        Writes the memory-mapped array out to its file
+
+    close()
+        Flushes and releases the array
+    """
+    def __init__(self, Channels, FileName=None, Rows=None):
+        if Rows is None:
+            Rows = c.TELEMETRY_STEPS if c.TELEMETRY_STEPS is not None else c.NUM_STEPS
+
+        self.Channels = ["step"] + list(Channels)
+        self.Rows = Rows
+        self.FileName = FileName
+        if FileName is None:
+            self.Values = numpy.empty((Rows, len(self.Channels)), dtype=numpy.float32)
+        else:
+            self.Values = numpy.lib.format.open_memmap(FileName, mode="w+", dtype=numpy.float32,
+                                                       shape=(Rows, len(self.Channels)))
+        self.Values.fill(numpy.nan)
+
+    def record(self, Step, Column, Values):
+        Row = Step % self.Rows
+        self.Values[Row, 0] = Step
+        self.Values[Row, Column:Column + len(Values)] = Values
+
+    def flush(self):
+        if self.FileName is not None:
+            self.Values.flush()
+
+    def close(self):
+        self.flush()
+        self.Values = None
+
+
+def get_telemetry(SolutionID, Channels):
+    """
+    Returns a new Telemetry recording for the Solution, memory-mapped to telemetry<SolutionID>.npy inside
+    c.TELEMETRY_DIRECTORY, or None when c.TELEMETRY_DIRECTORY is None and telemetry is disabled.
+    """
+    if c.TELEMETRY_DIRECTORY is None:
+        return None
+
+    os.makedirs(c.TELEMETRY_DIRECTORY, exist_ok=True)
+    return Telemetry(Channels, os.path.join(c.TELEMETRY_DIRECTORY, "telemetry" + str(SolutionID) + ".npy"))
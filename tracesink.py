@@ -0,0 +1,62 @@
+import os
+import struct
+import constants as c
+
+TraceSinks = {}
+
+
+class TraceSink:
+    """
+    The TraceSink class writes a sampled trace of the motor commands as compact fixed-size binary records instead of
+    printing them to the console. Every record is a little-endian int32 solution ID, an int32 step and one float32
+    desired angle per motor neuron.
+    ...
+
+    Parameters
+    __________
+    FileName : str
+        Path of the binary trace file, records are appended to it
+
+    Attributes
+    __________
+    File : file
+        Buffered binary file handle the records are written to
+
+    Methods
+    ________
+    write(SolutionID, Step, DesiredAngles)
+        Appends one record to the trace file
+
+    flush()
+        Forces the buffered records to disk, called at the end of every simulation since worker processes exit
+        without flushing open files
+
+    close()
+        Flushes and closes the trace file
+    """
+    def __init__(self, FileName):
+        self.File = open(FileName, "ab")
+
+    def write(self, SolutionID, Step, DesiredAngles):
+        self.File.write(struct.pack("<ii" + str(len(DesiredAngles)) + "f", SolutionID, Step, *DesiredAngles))
+
+    def flush(self):
+        self.File.flush()
+
+    def close(self):
+        self.File.close()
+
+
+def get_trace_sink():
+    """
+    Returns the TraceSink of the current process, or None when c.TRACE_DIRECTORY is None and tracing is disabled.
+    Each process writes its own trace<pid>.bin file so that concurrent workers never interleave records.
+    """
+    if c.TRACE_DIRECTORY is None:
+        return None
+
+    ProcessID = os.getpid()
+    if ProcessID not in TraceSinks:
+        os.makedirs(c.TRACE_DIRECTORY, exist_ok=True)
+        TraceSinks[ProcessID] = TraceSink(os.path.join(c.TRACE_DIRECTORY, "trace" + str(ProcessID) + ".bin"))
+    return TraceSinks[ProcessID]
@@ -1,9 +1,15 @@
 import pybullet as p
+from assets import get_world_file
 
 class World:
     """
     The Worled class establishes the physical conditions of the robot's environment.
        ...
+    Parameters
+    __________
+    Offsets : list array
+        Positions at which a copy of the world is loaded, defaults to a single copy at the origin
+
     Attributes
     __________
     PlaneId : pybullet loadURDF
@@ -14,7 +20,14 @@ class World:
     None
     """
 
-    def __init__(self):
+    def __init__(self, Offsets=None):
+        if Offsets is None:
+            Offsets = [[0, 0, 0]]
+
         self.PlaneId = p.loadURDF("plane.urdf")
-        p.loadSDF("world.sdf")
-        pass
+        for Offset in Offsets:
+            for Body in p.loadSDF(get_world_file()):
+                if Offset != [0, 0, 0]:
+                    Position, Orientation = p.getBasePositionAndOrientation(Body)
+                    Position = [Position[i] + Offset[i] for i in range(3)]
+                    p.resetBasePositionAndOrientation(Body, Position, Orientation)